@@ -0,0 +1,305 @@
+# Reproducible benchmark suite for the sorting algorithms of every lab.
+#
+# Every sort runs over seeded input distributions and sizes, and the results
+# (wall time, comparison and write counts, peak memory) are written as JSON so
+# that two runs can be diffed to catch regressions:
+#
+#   python sortBenchmark.py --output run.json
+#   python sortBenchmark.py --sizes 100 1000 10000 --output new.json --compare run.json
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# Root folder of the repository (this file lives in Benchmarks/)
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Function that loads one of the lab files as a module without printing its test cases.
+def load_lab_module(relative_path):
+    path = os.path.join(ROOT, relative_path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(module)
+    return module
+
+# Counter shared by the instrumented keys and lists
+class Counters:
+    comparisons = 0
+    writes = 0
+
+    @classmethod
+    def reset(cls):
+        cls.comparisons = 0
+        cls.writes = 0
+
+# Key class that counts every comparison made between two keys
+class CountingKey:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        Counters.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        Counters.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        Counters.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        Counters.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other):
+        Counters.comparisons += 1
+        return self.value == other.value
+
+    __hash__ = None
+
+# List class that counts every element written into it (a swap counts as two writes)
+class CountingList(list):
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            Counters.writes += len(range(*index.indices(len(self))))
+        else:
+            Counters.writes += 1
+        super().__setitem__(index, value)
+
+# Functions that generate the seeded input distributions
+def random_data(n, rng):
+    return [rng.randrange(2**31) for _ in range(n)]
+
+def sorted_data(n, rng):
+    return sorted(random_data(n, rng))
+
+def reversed_data(n, rng):
+    return sorted(random_data(n, rng), reverse=True)
+
+def nearly_sorted_data(n, rng):
+    # Sorted data with 1% of the elements swapped with random positions
+    data = sorted_data(n, rng)
+    for _ in range(max(n // 100, 1)):
+        i = rng.randrange(n)
+        j = rng.randrange(n)
+        data[i], data[j] = data[j], data[i]
+    return data
+
+def few_unique_data(n, rng):
+    return [rng.randrange(10) for _ in range(n)]
+
+def organ_pipe_data(n, rng):
+    # Ascending first half followed by a descending second half
+    half = n // 2
+    return list(range(half)) + list(range(n - half - 1, -1, -1))
+
+DISTRIBUTIONS = {
+    "random": random_data,
+    "sorted": sorted_data,
+    "reversed": reversed_data,
+    "nearly_sorted": nearly_sorted_data,
+    "few_unique": few_unique_data,
+    "organ_pipe": organ_pipe_data,
+}
+
+# Class that describes one sort to be benchmarked
+class Algorithm:
+    def __init__(self, name, sort, max_n=None, comparison=True, counts_writes=True, applies=None):
+        self.name = name
+        self.sort = sort # Function that sorts a list in place
+        self.max_n = max_n # Largest input size worth running (None for no limit)
+        self.comparison = comparison # Whether the sort only compares keys
+        # Whether every merge, swap or shift of the sort is a write through list.__setitem__;
+        # sorts that do their passes in their own buffers report no write count, since
+        # only the stores into the caller's list could be counted
+        self.counts_writes = counts_writes
+        self.applies = applies # Optional check that the input suits the sort
+
+# Function that returns every sort implemented in the labs
+def load_algorithms():
+    insertion = load_lab_module(os.path.join("Lab 1", "insertionSort.py"))
+    merge = load_lab_module(os.path.join("Lab 1", "mergeSort.py"))
+    quick = load_lab_module(os.path.join("Lab 3", "randomQuicksort.py"))
+    heap = load_lab_module(os.path.join("Lab 4", "heapsort.py"))
+    radix = load_lab_module(os.path.join("Lab 4", "radixSort.py"))
+    return [
+        Algorithm("insertion_sort", insertion.insertion_sort, max_n=10**4),
+        Algorithm("merge_sort", lambda A: merge.merge_sort(A, len(A))),
+        # Half of the merge passes write into an auxiliary list
+        Algorithm("bottom_up_merge_sort", merge.bottom_up_merge_sort, counts_writes=False),
+        # Lomuto partitioning is quadratic when most keys are duplicates
+        Algorithm("Randomized_Quicksort", lambda A: quick.Randomized_Quicksort(A, 0, len(A) - 1),
+                  applies=lambda data: len(data) <= 10**4 or len(set(data)) > len(data) // 100),
+        Algorithm("Randomized_Quicksort_Three_Way",
+                  lambda A: quick.Randomized_Quicksort_Three_Way(A, 0, len(A) - 1)),
+        Algorithm("Introsort", quick.Introsort),
+        Algorithm("Heapsort", heap.Heapsort),
+        # Counting sort allocates one counter per possible key; it and LSD radix sort fill
+        # their own output lists and copy them back once
+        Algorithm("Counting_Sort", radix.Counting_Sort, comparison=False, counts_writes=False,
+                  applies=lambda data: max(data) - min(data) <= 10 * len(data) + 1000),
+        Algorithm("LSD_Radix_Sort", lambda A: radix.LSD_Radix_Sort(A, use_numpy=False), comparison=False,
+                  counts_writes=False),
+        # The built-in sort writes to the list directly, so its writes cannot be counted
+        Algorithm("list.sort", list.sort, counts_writes=False),
+    ]
+
+# Function that runs one sort on one input and returns its measurements
+# The randomized sorts draw from the global random module, which is reseeded before
+# every run so that their comparison and write counts are reproducible too.
+def measure(algorithm, data, seed, repeat, count_limit, memory_limit):
+    result = {}
+    # Wall time: best of several runs on fresh copies
+    best = None
+    for _ in range(repeat):
+        arr = list(data)
+        random.seed(seed)
+        start = time.perf_counter()
+        algorithm.sort(arr)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    if arr != sorted(data):
+        raise AssertionError(f"{algorithm.name} returned an unsorted array")
+    result["seconds"] = best
+
+    # Comparison and write counts on an instrumented copy (much slower, so capped)
+    result["comparisons"] = None
+    result["writes"] = None
+    if len(data) <= count_limit:
+        keys = [CountingKey(x) for x in data] if algorithm.comparison else data
+        arr = CountingList(keys)
+        Counters.reset()
+        random.seed(seed)
+        algorithm.sort(arr)
+        result["comparisons"] = Counters.comparisons if algorithm.comparison else None
+        result["writes"] = Counters.writes if algorithm.counts_writes else None
+
+    # Peak memory allocated by the sort itself (tracing slows the sort, so capped)
+    result["peak_bytes"] = None
+    if len(data) <= memory_limit:
+        arr = list(data)
+        random.seed(seed)
+        tracemalloc.start()
+        algorithm.sort(arr)
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+# Function that runs every sort over every distribution and size
+def run_benchmarks(algorithms, distributions, sizes, seed, repeat, count_limit, memory_limit):
+    results = []
+    for n in sizes:
+        for dist_name in distributions:
+            # Every (distribution, size) pair has its own seed, so runs are reproducible
+            run_seed = f"{seed}-{dist_name}-{n}"
+            data = DISTRIBUTIONS[dist_name](n, random.Random(run_seed))
+            for algorithm in algorithms:
+                entry = {"algorithm": algorithm.name, "distribution": dist_name, "n": n}
+                if algorithm.max_n is not None and n > algorithm.max_n:
+                    entry["skipped"] = "input too large"
+                elif algorithm.applies is not None and not algorithm.applies(data):
+                    entry["skipped"] = "input not supported"
+                else:
+                    try:
+                        entry.update(measure(algorithm, data, run_seed, repeat, count_limit, memory_limit))
+                    except RecursionError:
+                        tracemalloc.stop()
+                        entry["error"] = "RecursionError"
+                results.append(entry)
+                print(format_entry(entry), flush=True)
+    return results
+
+# Function that formats one result as a line of text
+def format_entry(entry):
+    line = f"{entry['algorithm']:>31} {entry['distribution']:>13} n={entry['n']:<9}"
+    if "skipped" in entry:
+        return line + " skipped (" + entry["skipped"] + ")"
+    if "error" in entry:
+        return line + " " + entry["error"]
+    line += f" {entry['seconds']:10.5f} s"
+    if entry["comparisons"] is not None:
+        line += f"  cmp={entry['comparisons']}"
+    if entry["writes"] is not None:
+        line += f"  writes={entry['writes']}"
+    if entry["peak_bytes"] is not None:
+        line += f"  peak={entry['peak_bytes']} B"
+    return line
+
+# Function that compares two benchmark runs and returns the regressions found.
+# A result regresses when it got slower by more than the threshold, or when it
+# makes more comparisons or writes than before (those counts are deterministic).
+def compare_runs(baseline, current, threshold):
+    old = {(e["algorithm"], e["distribution"], e["n"]): e for e in baseline["results"]}
+    regressions = []
+    for entry in current["results"]:
+        before = old.get((entry["algorithm"], entry["distribution"], entry["n"]))
+        if before is None or "seconds" not in entry or "seconds" not in before:
+            continue
+        label = f"{entry['algorithm']} {entry['distribution']} n={entry['n']}"
+        if entry["seconds"] > before["seconds"] * (1 + threshold):
+            regressions.append(f"{label}: {before['seconds']:.5f} s -> {entry['seconds']:.5f} s")
+        for field in ("comparisons", "writes"):
+            if entry[field] is not None and before[field] is not None and entry[field] > before[field]:
+                regressions.append(f"{label}: {field} {before[field]} -> {entry[field]}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sorting algorithms of every lab.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**e for e in range(2, 8)])
+    parser.add_argument("--distributions", nargs="+", default=list(DISTRIBUTIONS), choices=list(DISTRIBUTIONS))
+    parser.add_argument("--algorithms", nargs="+", help="names of the sorts to run (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per input (the best is kept)")
+    parser.add_argument("--count-limit", type=int, default=10**5, help="largest n with comparison/write counts")
+    parser.add_argument("--memory-limit", type=int, default=10**6, help="largest n with peak memory tracing")
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--compare", help="earlier JSON results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before a regression")
+    args = parser.parse_args(argv)
+
+    algorithms = load_algorithms()
+    if args.algorithms:
+        algorithms = [a for a in algorithms if a.name in args.algorithms]
+    # Deep recursion in the quicksort variants should fail as RecursionError, not crash
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+    run = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": run_benchmarks(algorithms, args.distributions, args.sizes, args.seed,
+                                  args.repeat, args.count_limit, args.memory_limit),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_runs(baseline, run, args.threshold)
+        print(f"\n{len(regressions)} regression(s) against {args.compare}")
+        for line in regressions:
+            print("  " + line)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# Implementation for external (out-of-core) merge sort algorithm
+
+import heapq
+import os
+import random
+import sys
+import tempfile
+
+# Function that sorts the records (lines) of a file that may not fit in memory.
+# The input is read in chunks that fit in the memory budget, each chunk is sorted
+# in memory and spilled to a temporary file as a sorted run, and the runs are
+# then combined with a k-way heap-based merge, at most fan_in runs at a time.
+def external_merge_sort(input_path, output_path, key=None, memory_budget=64 * 1024 * 1024,
+                        fan_in=64, temp_dir=None):
+    # The merge needs at least two runs at a time to make progress
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    # Keep the temporary runs in their own directory so they are always cleaned up
+    with tempfile.TemporaryDirectory(dir=temp_dir) as run_dir:
+        # Phase 1: split the input into sorted runs
+        runs = create_sorted_runs(input_path, run_dir, key, memory_budget)
+        # Each open run gets an equal share of the memory budget as its read buffer
+        buffer_size = max(memory_budget // (fan_in + 1), 4096)
+        # Phase 2: merge groups of fan_in runs until few enough runs remain
+        pass_number = 0
+        while len(runs) > fan_in:
+            merged_runs = []
+            # Iterate through the runs fan_in at a time
+            for i in range(0, len(runs), fan_in):
+                group = runs[i:i + fan_in]
+                merged_path = os.path.join(run_dir, f"pass{pass_number}_{i // fan_in}.run")
+                merge_sorted_runs(group, merged_path, key, buffer_size)
+                # The merged runs are no longer needed
+                for run_path in group:
+                    os.remove(run_path)
+                merged_runs.append(merged_path)
+            runs = merged_runs
+            pass_number += 1
+        # Phase 3: the final merge writes directly to the output file
+        merge_sorted_runs(runs, output_path, key, buffer_size)
+
+# Function that returns a record without its line terminator.
+# Records are compared without the newline, since characters below "\n" (such as
+# tabs) would otherwise sort a record after its own prefix.
+def strip_terminator(line):
+    return line[:-1] if line.endswith("\n") else line
+
+# Function that reads the input in chunks that fit in the memory budget,
+# sorts each chunk in memory and writes it to a temporary file as a sorted run.
+def create_sorted_runs(input_path, run_dir, key, memory_budget):
+    runs = []
+    chunk = []
+    chunk_bytes = 0
+    with open(input_path, "r", buffering=1024 * 1024) as infile:
+        # Iterate through every record of the input
+        for line in infile:
+            record = strip_terminator(line)
+            chunk.append(record)
+            # Account for the record and the list slot that points to it
+            chunk_bytes += sys.getsizeof(record) + 8
+            # Check if the chunk has used up the memory budget
+            if chunk_bytes >= memory_budget:
+                runs.append(write_sorted_run(chunk, run_dir, len(runs), key))
+                chunk = []
+                chunk_bytes = 0
+    # Spill the last partial chunk
+    if chunk:
+        runs.append(write_sorted_run(chunk, run_dir, len(runs), key))
+    return runs
+
+# Function that sorts a chunk in memory and writes it to a run file, one record per line.
+def write_sorted_run(chunk, run_dir, run_number, key):
+    chunk.sort(key=key)
+    run_path = os.path.join(run_dir, f"run{run_number}.run")
+    with open(run_path, "w", buffering=1024 * 1024) as run_file:
+        run_file.writelines(record + "\n" for record in chunk)
+    return run_path
+
+# Function that merges sorted run files into one sorted output file with a min-heap.
+# The heap holds one record per run; the run index breaks ties between equal keys
+# so that records from earlier runs come first and the sort stays stable.
+def merge_sorted_runs(run_paths, output_path, key, buffer_size):
+    files = [open(path, "r", buffering=buffer_size) for path in run_paths]
+    try:
+        heap = []
+        # Push the first record of every run onto the heap
+        for i, run_file in enumerate(files):
+            line = run_file.readline()
+            if line:
+                record = strip_terminator(line)
+                heap.append((record if key is None else key(record), i, record))
+        heapq.heapify(heap)
+        with open(output_path, "w", buffering=buffer_size) as outfile:
+            # Loop until every run is exhausted
+            while heap:
+                _, i, record = heap[0]
+                # Write the smallest record to the output
+                outfile.write(record)
+                outfile.write("\n")
+                # Replace it with the next record of the same run
+                line = files[i].readline()
+                if line:
+                    record = strip_terminator(line)
+                    heapq.heapreplace(heap, (record if key is None else key(record), i, record))
+                else:
+                    # The run is exhausted
+                    heapq.heappop(heap)
+    finally:
+        for run_file in files:
+            run_file.close()
+
+# Test case 1
+with tempfile.TemporaryDirectory() as work_dir:
+    input_path = os.path.join(work_dir, "records.txt")
+    output_path = os.path.join(work_dir, "sorted.txt")
+    random.seed(1)
+    numbers = [random.randint(0, 100000) for _ in range(20000)]
+    with open(input_path, "w") as f:
+        f.write("\n".join(str(x) for x in numbers))
+    # A small budget and fan-in force several runs and merge passes
+    external_merge_sort(input_path, output_path, key=int, memory_budget=64 * 1024, fan_in=4)
+    with open(output_path) as f:
+        result = [int(line) for line in f]
+    print("First records:", result[:10])
+    print("Sorted correctly:", result == sorted(numbers))
+
+# Test case 2
+with tempfile.TemporaryDirectory() as work_dir:
+    input_path = os.path.join(work_dir, "records.txt")
+    output_path = os.path.join(work_dir, "sorted.txt")
+    with open(input_path, "w") as f:
+        f.write("pear\napple\nfig\nbanana\ncherry\n")
+    external_merge_sort(input_path, output_path, memory_budget=256, fan_in=2)
+    with open(output_path) as f:
+        print("Sorted records:", f.read().split())
+
+# Test case 3
+with tempfile.TemporaryDirectory() as work_dir:
+    input_path = os.path.join(work_dir, "records.txt")
+    output_path = os.path.join(work_dir, "sorted.txt")
+    # Records with characters below "\n" must still sort after their prefix "a"
+    records = ["b", "a\tb", "a", "a\x01"]
+    with open(input_path, "w") as f:
+        f.write("\n".join(records) + "\n")
+    external_merge_sort(input_path, output_path, memory_budget=128, fan_in=2)
+    with open(output_path) as f:
+        result = f.read().split("\n")[:-1]
+    print("Sorted records:", result)
+    print("Sorted correctly:", result == sorted(records))
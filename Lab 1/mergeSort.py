@@ -71,6 +71,158 @@ def merge_sorted_arrays(arr, left, mid, right):
         # Move to the next position in the main array
         k += 1
 
+# Minimum length of a run before it is merged with its neighbours
+MIN_RUN = 32
+
+# Function that sorts an array with an iterative bottom-up merge sort.
+# Ascending and strictly descending runs that already exist in the input are
+# detected first, so partly ordered data only needs a few merge passes.
+# A single auxiliary buffer is reused by every merge pass.
+def bottom_up_merge_sort(arr, key=None):
+    n = len(arr)
+    # An array with fewer than two elements is already sorted
+    if n < 2:
+        return
+    # Compute the sort keys once, or compare the elements directly
+    if key is None:
+        keys = arr
+        items = None
+    else:
+        keys = [key(x) for x in arr]
+        items = arr
+
+    # Split the array into sorted runs
+    runs = find_runs(keys, items, n)
+
+    # Allocate the auxiliary buffers once for the whole sort
+    buffer_keys = [None] * n
+    buffer_items = [None] * n if items is not None else None
+
+    # The merge passes alternate between the array and the buffer
+    src_keys, src_items = keys, items
+    dst_keys, dst_items = buffer_keys, buffer_items
+
+    # Merge adjacent runs until only one run covers the whole array
+    while len(runs) > 2:
+        merged = [0]
+        # Iterate through the runs two at a time
+        for r in range(0, len(runs) - 2, 2):
+            left = runs[r]
+            mid = runs[r + 1]
+            right = runs[r + 2]
+            merge_runs(src_keys, src_items, dst_keys, dst_items, left, mid, right)
+            merged.append(right)
+        # Copy an unpaired run at the end into the destination as it is
+        if len(runs) % 2 == 0:
+            left = runs[-2]
+            dst_keys[left:n] = src_keys[left:n]
+            if src_items is not None:
+                dst_items[left:n] = src_items[left:n]
+            merged.append(n)
+        runs = merged
+        # The destination of this pass is the source of the next one
+        src_keys, dst_keys = dst_keys, src_keys
+        src_items, dst_items = dst_items, src_items
+
+    # Copy the result back if the last pass finished in the buffer
+    if key is None:
+        if src_keys is not arr:
+            arr[:] = src_keys
+    elif src_items is not arr:
+        arr[:] = src_items
+
+# Function that splits an array into sorted runs and returns their boundaries.
+# Strictly descending runs are reversed in place (strict so that equal
+# elements keep their order), and short runs are extended to MIN_RUN
+# elements with insertion sort.
+def find_runs(keys, items, n):
+    runs = [0]
+    start = 0
+    # Iterate until every element belongs to a run
+    while start < n:
+        end = start + 1
+        # Check whether the run is descending or ascending
+        if end < n and keys[end] < keys[start]:
+            # Extend the strictly descending run
+            while end + 1 < n and keys[end + 1] < keys[end]:
+                end += 1
+            end += 1
+            # Reverse the run so that it becomes ascending
+            keys[start:end] = keys[start:end][::-1]
+            if items is not None:
+                items[start:end] = items[start:end][::-1]
+        else:
+            # Extend the ascending run
+            while end < n and keys[end - 1] <= keys[end]:
+                end += 1
+        # Extend a short run with insertion sort
+        if end - start < MIN_RUN and end < n:
+            forced_end = min(start + MIN_RUN, n)
+            insertion_sort_run(keys, items, start, end, forced_end)
+            end = forced_end
+        runs.append(end)
+        # The next run starts right after this one
+        start = end
+    return runs
+
+# Function that inserts the elements arr[sorted_end..end-1] into the sorted
+# run arr[start..sorted_end-1]
+def insertion_sort_run(keys, items, start, sorted_end, end):
+    for i in range(sorted_end, end):
+        # Get the current key (and element) to be inserted
+        key = keys[i]
+        if items is not None:
+            item = items[i]
+        j = i - 1
+        # Shift the greater elements of the run to the right by one position
+        while j >= start and keys[j] > key:
+            keys[j + 1] = keys[j]
+            if items is not None:
+                items[j + 1] = items[j]
+            j -= 1
+        # Insert the key at its correct position
+        keys[j + 1] = key
+        if items is not None:
+            items[j + 1] = item
+
+# Function that merges the sorted runs src[left..mid-1] and src[mid..right-1]
+# into dst[left..right-1]. The elements are moved together with their keys.
+def merge_runs(src_keys, src_items, dst_keys, dst_items, left, mid, right):
+    # Check if the two runs are already in order and can be copied as one block
+    if src_keys[mid - 1] <= src_keys[mid]:
+        dst_keys[left:right] = src_keys[left:right]
+        if src_items is not None:
+            dst_items[left:right] = src_items[left:right]
+        return
+
+    # Set the initial indices to compare the elements in the LHS and the RHS
+    i = left; j = mid; k = left
+
+    # Loop through the LHS and RHS runs until one of them is exhausted
+    while i < mid and j < right:
+        # Check if the element should be copied from the LHS (keeps equal elements stable)
+        if src_keys[i] <= src_keys[j]:
+            dst_keys[k] = src_keys[i]
+            if src_items is not None:
+                dst_items[k] = src_items[i]
+            i += 1
+        else:
+            dst_keys[k] = src_keys[j]
+            if src_items is not None:
+                dst_items[k] = src_items[j]
+            j += 1
+        k += 1
+
+    # Copy the remaining elements of whichever run is left as one block
+    if i < mid:
+        dst_keys[k:right] = src_keys[i:mid]
+        if src_items is not None:
+            dst_items[k:right] = src_items[i:mid]
+    else:
+        dst_keys[k:right] = src_keys[j:right]
+        if src_items is not None:
+            dst_items[k:right] = src_items[j:right]
+
 #Test case 1
 arr_1 = [12, 3, 7, 9, 14, 6, 11, 2]
 merge_sort(arr_1, len(arr_1))
@@ -79,4 +231,14 @@ print(arr_1)
 #Test case 2
 arr_2 = [4, 9, 20, 12, 15, 7, 1, 2, 50, 32, 41, 30, 14, 8, 19, 25]
 merge_sort(arr_2 , len(arr_2))
-print(arr_2)
\ No newline at end of file
+print(arr_2)
+
+#Test case 3
+arr_3 = [1, 2, 3, 4, 10, 9, 8, 7, 5, 6, 11, 12, 13]
+bottom_up_merge_sort(arr_3)
+print(arr_3)
+
+#Test case 4
+arr_4 = [("b", 3), ("a", 1), ("c", 3), ("d", 2), ("e", 1)]
+bottom_up_merge_sort(arr_4, key=lambda record: record[1])
+print(arr_4)
\ No newline at end of file
@@ -0,0 +1,169 @@
+# Implementation for parallel merge sort algorithm using a process pool
+
+import bisect
+import heapq
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# Function that returns the array typecode used to store the elements in shared memory,
+# or None if they cannot be stored there exactly. Only fixed-width numbers can be shared
+# without pickling them, and a mix of ints and floats is not converted, since that
+# would change the element types and round ints above 2^53.
+def shared_typecode(arr):
+    if all(type(x) is int and -2**63 <= x < 2**63 for x in arr):
+        return "q" # 64-bit signed integers
+    if all(type(x) is float for x in arr):
+        return "d" # 64-bit floats
+    return None
+
+# Function that sorts one chunk of the shared array in place (runs in a worker process).
+def sort_chunk(shm_name, typecode, low, high):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    view = shm.buf.cast(typecode)
+    try:
+        # Sort a local copy of the chunk and write it back into shared memory
+        chunk = view[low:high].tolist()
+        chunk.sort()
+        view[low:high] = array(typecode, chunk)
+    finally:
+        # The view must be released before the shared memory can be closed
+        view.release()
+        shm.close()
+
+# Function that merges one partition of every sorted chunk into the output array
+# (runs in a worker process). ranges holds a (low, high) slice of each chunk and
+# out_low is the position of the partition in the output array.
+def merge_partition(src_name, dst_name, typecode, ranges, out_low):
+    src = shared_memory.SharedMemory(name=src_name)
+    dst = shared_memory.SharedMemory(name=dst_name)
+    src_view = src.buf.cast(typecode)
+    dst_view = dst.buf.cast(typecode)
+    try:
+        # k-way merge of the slices that fall into this partition
+        runs = [src_view[low:high].tolist() for low, high in ranges]
+        merged = array(typecode, heapq.merge(*runs))
+        dst_view[out_low:out_low + len(merged)] = merged
+    finally:
+        src_view.release()
+        dst_view.release()
+        src.close()
+        dst.close()
+
+# Function that sorts an array of numbers using a process pool.
+# The array is copied into shared memory once, every worker sorts one chunk in place,
+# and the sorted chunks are then merged in parallel: splitters sampled from the chunks
+# divide the key range into one partition per worker, and each worker merges the
+# elements of its partition into the output array at a precomputed offset.
+def parallel_merge_sort(arr, workers=None, executor=None):
+    n = len(arr)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    typecode = shared_typecode(arr)
+    # Check if the array is too small to be worth splitting, or cannot be shared exactly
+    if workers < 2 or n < 2 * workers or typecode is None:
+        arr.sort()
+        return
+    itemsize = array(typecode).itemsize
+
+    # Allocate the input and output arrays in shared memory
+    src = shared_memory.SharedMemory(create=True, size=n * itemsize)
+    dst = shared_memory.SharedMemory(create=True, size=n * itemsize)
+    src_view = src.buf.cast(typecode)
+    dst_view = dst.buf.cast(typecode)
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        src_view[:] = array(typecode, arr)
+
+        # Phase 1: sort one chunk per worker
+        bounds = [n * w // workers for w in range(workers + 1)]
+        futures = [executor.submit(sort_chunk, src.name, typecode, bounds[w], bounds[w + 1])
+                   for w in range(workers)]
+        for future in futures:
+            future.result()
+
+        # Phase 2: choose workers - 1 splitters by regular sampling of the sorted chunks
+        samples = []
+        for w in range(workers):
+            low, high = bounds[w], bounds[w + 1]
+            for s in range(1, workers):
+                samples.append(src_view[low + (high - low) * s // workers])
+        samples.sort()
+        splitters = [samples[s * (workers - 1)] for s in range(1, workers)]
+
+        # Find where every splitter falls in every chunk with binary search
+        cuts = []
+        for w in range(workers):
+            low, high = bounds[w], bounds[w + 1]
+            cuts.append([low] + [bisect.bisect_left(src_view, x, low, high) for x in splitters] + [high])
+
+        # Phase 3: merge each partition of the chunks in parallel
+        futures = []
+        out_low = 0
+        for part in range(workers):
+            ranges = [(cuts[w][part], cuts[w][part + 1]) for w in range(workers)]
+            futures.append(executor.submit(merge_partition, src.name, dst.name, typecode, ranges, out_low))
+            # The next partition starts right after the elements of this one
+            out_low += sum(high - low for low, high in ranges)
+        for future in futures:
+            future.result()
+
+        # Copy the sorted result back into the original list
+        arr[:] = dst_view.tolist()
+    finally:
+        if own_executor:
+            executor.shutdown()
+        src_view.release()
+        dst_view.release()
+        src.close()
+        dst.close()
+        src.unlink()
+        dst.unlink()
+
+# Function that measures how the parallel sort scales with the number of workers.
+def benchmark_scaling(n, max_workers=None, seed=0):
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    rng = random.Random(seed)
+    data = [rng.randint(-2**31, 2**31) for _ in range(n)]
+    expected = sorted(data)
+
+    # Time the serial sort as the baseline
+    start = time.perf_counter()
+    sorted(data)
+    serial_time = time.perf_counter() - start
+    print(f"n = {n}, serial sort: {serial_time:.3f} s")
+
+    workers = 1
+    while workers <= max_workers:
+        # Start the pool before timing so that process startup is not measured
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            arr = list(data)
+            start = time.perf_counter()
+            parallel_merge_sort(arr, workers=workers, executor=executor)
+            elapsed = time.perf_counter() - start
+        assert arr == expected
+        print(f"workers = {workers:2d}: {elapsed:.3f} s, speedup {serial_time / elapsed:.2f}x")
+        workers *= 2
+
+# The process pool re-imports this module in the workers on some platforms,
+# so the test cases only run when the file is executed directly.
+if __name__ == "__main__":
+    # Test case 1
+    arr_1 = [12, 3, 7, 9, 14, 6, 11, 2, 5, 1, 8, 4, 10, 13, 16, 15]
+    parallel_merge_sort(arr_1, workers=4)
+    print(arr_1)
+
+    # Test case 2
+    arr_2 = [random.uniform(-1000, 1000) for _ in range(100000)]
+    expected_2 = sorted(arr_2)
+    parallel_merge_sort(arr_2, workers=4)
+    print("Matches serial sort:", arr_2 == expected_2)
+
+    # Benchmark
+    benchmark_scaling(1000000)
@@ -1,8 +1,29 @@
 # Implementation for binary search algorithm
 
+# NumPy is optional; without it the batch searches run in pure Python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Function to initiate the binary search algorithm
 def binary_search(arr, n, target):
-    return binary_search_recursive(arr, 0, n - 1, target)
+    return binary_search_iterative(arr, 0, n - 1, target)
+
+# Helper function to perform the binary search with a loop instead of recursion.
+def binary_search_iterative(arr, low, high, target):
+    # Loop until the search range is empty
+    while low <= high:
+        # Find the middle index of the range
+        mid = low + (high - low) // 2
+
+        if arr[mid] == target:
+            return mid # Target found
+        elif arr[mid] > target:
+            high = mid - 1 # Search the left half
+        else:
+            low = mid + 1 # Search the right half
+    return -1 # Target not found
 
 # Helper function to perform the recursive binary search.
 def binary_search_recursive(arr, low, high, target):
@@ -20,26 +41,128 @@ def binary_search_recursive(arr, low, high, target):
     else:
         return binary_search_recursive(arr, mid + 1, high, target) # Search the right half
 
-# Test case 1
-arr1 = [3, 5, 7, 8, 9, 12, 15] # Sorted array
-target = 9
-n = len(arr1) 
-print(f"Search for element {target} in {arr1}")
-
-result = binary_search(arr1, n, target)
-if result != -1:
-    print(f"Element found at index {result}\n")
-else:
-    print("Element is not present in array\n")
-
-# Test case 2
-arr2 = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10] # Sorted array
-target = 11
-n = len(arr2)
-print(f"Search for element {target} in {arr2}")
-
-result = binary_search(arr2, n, target)
-if result != -1:
-    print(f"Element found at index {result}\n")
-else:
-    print("Element was not found in the array\n")
+# Function that returns the first index in arr[low..high-1] whose element is not less than target.
+def lower_bound(arr, target, low=0, high=None):
+    if high is None:
+        high = len(arr)
+    # Loop until the range shrinks to a single position
+    while low < high:
+        mid = low + (high - low) // 2
+        if arr[mid] < target:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+# Function that returns the first index in arr[low..high-1] whose element is greater than target.
+def upper_bound(arr, target, low=0, high=None):
+    if high is None:
+        high = len(arr)
+    # Loop until the range shrinks to a single position
+    while low < high:
+        mid = low + (high - low) // 2
+        if arr[mid] <= target:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+# Helper function that finds the bound of every target in ascending order.
+# Each search gallops forward from the previous bound (1, 2, 4, ... steps) and then
+# binary searches the last step, so the whole sweep costs O(m log(n / m)) for m targets:
+# a merge-like linear scan when the targets are dense, and m binary searches when sparse.
+def sweep_bounds(arr, sorted_targets, bound):
+    n = len(arr)
+    results = []
+    low = 0 # Bound of the previous target; later targets cannot have a smaller one
+    for target in sorted_targets:
+        high = low
+        step = 1
+        # Gallop forward while arr[high] is still before the bound of the target
+        while high < n and (arr[high] < target if bound is lower_bound else arr[high] <= target):
+            low = high + 1
+            high = high + step
+            step = step * 2
+        # The bound is now in arr[low..high]; binary search that range
+        low = bound(arr, target, low, min(high, n))
+        results.append(low)
+    return results
+
+# Helper function that finds the lower or upper bound of every target in one call.
+def bound_batch(arr, targets, side, use_numpy):
+    targets = list(targets)
+    if use_numpy is None:
+        use_numpy = np is not None
+    # Vectorized path: NumPy searches every target in one call
+    if use_numpy and np is not None:
+        return np.searchsorted(np.asarray(arr), np.asarray(targets), side=side).tolist()
+    bound = lower_bound if side == "left" else upper_bound
+    # Check if the targets are already in ascending order
+    if all(targets[i] <= targets[i + 1] for i in range(len(targets) - 1)):
+        return sweep_bounds(arr, targets, bound)
+    # Otherwise sweep the targets in sorted order and scatter the results back
+    order = sorted(range(len(targets)), key=targets.__getitem__)
+    results = [0] * len(targets)
+    for i, position in zip(order, sweep_bounds(arr, [targets[i] for i in order], bound)):
+        results[i] = position
+    return results
+
+# Function that returns the lower bound of every target in a sorted array.
+def lower_bound_batch(arr, targets, use_numpy=None):
+    return bound_batch(arr, targets, "left", use_numpy)
+
+# Function that returns the upper bound of every target in a sorted array.
+def upper_bound_batch(arr, targets, use_numpy=None):
+    return bound_batch(arr, targets, "right", use_numpy)
+
+# Function that searches a sorted array for many targets at once.
+# Returns the index of the first occurrence of each target, or -1 when it is not present.
+def binary_search_batch(arr, targets, use_numpy=None):
+    targets = list(targets)
+    n = len(arr)
+    if use_numpy is None:
+        use_numpy = np is not None
+    # Vectorized path: search and check every target without a Python loop
+    if use_numpy and np is not None and n > 0:
+        values = np.asarray(arr)
+        keys = np.asarray(targets)
+        positions = np.searchsorted(values, keys, side="left")
+        found = (positions < n) & (values[np.minimum(positions, n - 1)] == keys)
+        return np.where(found, positions, -1).tolist()
+    positions = lower_bound_batch(arr, targets, False)
+    # A target is present when its lower bound points at an equal element
+    return [i if i < n and arr[i] == target else -1 for i, target in zip(positions, targets)]
+
+# The test cases only run when the file is executed directly, since other labs import it.
+if __name__ == "__main__":
+    # Test case 1
+    arr1 = [3, 5, 7, 8, 9, 12, 15] # Sorted array
+    target = 9
+    n = len(arr1)
+    print(f"Search for element {target} in {arr1}")
+
+    result = binary_search(arr1, n, target)
+    if result != -1:
+        print(f"Element found at index {result}\n")
+    else:
+        print("Element is not present in array\n")
+
+    # Test case 2
+    arr2 = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10] # Sorted array
+    target = 11
+    n = len(arr2)
+    print(f"Search for element {target} in {arr2}")
+
+    result = binary_search(arr2, n, target)
+    if result != -1:
+        print(f"Element found at index {result}\n")
+    else:
+        print("Element was not found in the array\n")
+
+    # Test case 3
+    arr3 = [1, 3, 3, 3, 5, 8, 13, 21] # Sorted array
+    targets = [13, 3, 4, 21, 0, 1]
+    print(f"Search for elements {targets} in {arr3}")
+    print(f"Indices: {binary_search_batch(arr3, targets)}")
+    print(f"Lower bounds: {lower_bound_batch(arr3, targets)}")
+    print(f"Upper bounds: {upper_bound_batch(arr3, targets)}")
@@ -0,0 +1,150 @@
+# Implementation for a flat, array-backed matrix type with zero-copy submatrix views.
+
+from array import array
+from operator import add, sub
+
+# Matrix class that stores its elements in one contiguous row-major buffer of 64-bit floats.
+# A matrix can also be a view into another matrix's buffer: element (i, j) is stored at
+# data[offset + i * stride + j], so a quadrant is just a different offset and size over
+# the same buffer and nothing is copied. The buffer can be a memoryview of 'd' items
+# (over an array('d') or over shared memory) or a one-dimensional NumPy float64 array;
+# a plain array('d') is wrapped in a memoryview, since slicing an array copies it.
+class Matrix:
+    __slots__ = ("data", "offset", "rows", "cols", "stride")
+
+    def __init__(self, rows, cols, data=None, offset=0, stride=None):
+        if data is None:
+            data = array("d", [0.0]) * (rows * cols) # 8 bytes per element
+        if isinstance(data, array):
+            data = memoryview(data) # Slices of a memoryview share the buffer
+        self.data = data # Shared buffer
+        self.offset = offset # Position of element (0, 0) in the buffer
+        self.rows = rows
+        self.cols = cols
+        self.stride = cols if stride is None else stride # Distance between two rows
+
+    # Method that creates a matrix from a list of lists
+    @classmethod
+    def from_lists(cls, lists):
+        rows = len(lists)
+        cols = len(lists[0]) if rows else 0
+        return cls(rows, cols, array("d", [x for row in lists for x in row]))
+
+    # Method that returns the matrix as a list of lists
+    def to_lists(self):
+        return [list(self.row(i)) for i in range(self.rows)]
+
+    # Method that returns element (i, j)
+    def __getitem__(self, index):
+        i, j = index
+        return self.data[self.offset + i * self.stride + j]
+
+    # Method that sets element (i, j)
+    def __setitem__(self, index, value):
+        i, j = index
+        self.data[self.offset + i * self.stride + j] = value
+
+    # Method that returns row i as a zero-copy slice of the buffer
+    def row(self, i):
+        start = self.offset + i * self.stride
+        return self.data[start:start + self.cols]
+
+    # Method that overwrites row i with the given values
+    def set_row(self, i, values):
+        start = self.offset + i * self.stride
+        self.data[start:start + self.cols] = array("d", values)
+
+    # Method that returns a view of the rows x cols submatrix starting at (row, col)
+    def view(self, row, col, rows, cols):
+        return Matrix(rows, cols, self.data, self.offset + row * self.stride + col, self.stride)
+
+    # Method that returns views of the four quadrants (the first half gets the smaller part)
+    def quadrants(self):
+        top = self.rows // 2
+        left = self.cols // 2
+        return (self.view(0, 0, top, left), self.view(0, left, top, self.cols - left),
+                self.view(top, 0, self.rows - top, left),
+                self.view(top, left, self.rows - top, self.cols - left))
+
+    def __repr__(self):
+        return f"Matrix({self.to_lists()})"
+
+# Function that stores X + Y in Z (any of them may be views, and Z may be X or Y).
+def add_into(X, Y, Z):
+    for i in range(X.rows):
+        Z.set_row(i, map(add, X.row(i), Y.row(i)))
+
+# Function that stores X - Y in Z (any of them may be views, and Z may be X or Y).
+def subtract_into(X, Y, Z):
+    for i in range(X.rows):
+        Z.set_row(i, map(sub, X.row(i), Y.row(i)))
+
+# Function that adds A * B to C with an iterative loop in i-k-j order.
+def multiply_add_kernel(A, B, C):
+    for i in range(A.rows):
+        # Accumulate a_ik * (row k of B) into row i of C
+        C_row = list(C.row(i))
+        A_row = A.row(i)
+        for k in range(A.cols):
+            a = A_row[k]
+            if a != 0:
+                C_row = [c + a * b for c, b in zip(C_row, B.row(k))]
+        C.set_row(i, C_row)
+
+# Function that splits a dimension in two halves, or keeps it whole if it fits in a leaf.
+def split_dimension(size, leaf_size):
+    if size <= leaf_size:
+        return [(0, size)]
+    half = size // 2
+    return [(0, half), (half, size - half)]
+
+# Function that recursively adds A * B to C working on views of the quadrants.
+# Each level splits the rows of A, the shared inner dimension and the columns of B
+# in half and performs the (up to) 8 quadrant products on views, so no submatrix is
+# ever copied. Any sizes work; sizes do not have to be powers of two.
+def multiply_recursive(A, B, C, leaf_size=32):
+    # Base case for when the blocks are small enough for the iterative kernel
+    if A.rows <= leaf_size and A.cols <= leaf_size and B.cols <= leaf_size:
+        multiply_add_kernel(A, B, C)
+        return
+    # C[i][j] += A[i][k] * B[k][j] over the halves of every dimension
+    for row, rows in split_dimension(A.rows, leaf_size):
+        for col, cols in split_dimension(B.cols, leaf_size):
+            C_block = C.view(row, col, rows, cols)
+            for mid, mids in split_dimension(A.cols, leaf_size):
+                multiply_recursive(A.view(row, mid, rows, mids), B.view(mid, col, mids, cols),
+                                   C_block, leaf_size)
+
+# Function to initiate the matrix multiplication of two flat matrices (returns A * B).
+def multiply(A, B, leaf_size=32):
+    if A.cols != B.rows:
+        raise ValueError("matrix dimensions do not match")
+    C = Matrix(A.rows, B.cols)
+    multiply_recursive(A, B, C, leaf_size)
+    return C
+
+# The test cases only run when the file is executed directly, since other labs import it.
+if __name__ == "__main__":
+    # Test case 1
+    matrixA = Matrix.from_lists([
+        [5, 2, 6, 1],
+        [0, 6, 2, 0],
+        [3, 8, 1, 4],
+        [1, 8, 5, 6]
+    ])
+    matrixB = Matrix.from_lists([
+        [7, 5, 8, 0],
+        [1, 8, 2, 6],
+        [9, 4, 3, 8],
+        [5, 3, 7, 9]
+    ])
+    print("Matrix C = A * B")
+    for row in multiply(matrixA, matrixB, leaf_size=1).to_lists():
+        print(row)
+
+    # Test case 2
+    A11, A12, A21, A22 = matrixA.quadrants()
+    print("\nQuadrant A22 (a view over the buffer of A):", A22.to_lists())
+    add_into(A11, A22, A11) # Writes through the view into A
+    print("Matrix A after A11 += A22:", matrixA.to_lists())
+    print("Bytes per element:", matrixA.data.itemsize)
@@ -1,5 +1,8 @@
 # Implementation for the recursive matrix multiplication algorithm.
 
+import random
+import time
+
 # Function that adds two matrices together. 
 def add_matrix(A, B, C, row, col, n):
     for i in range(n):
@@ -35,55 +38,218 @@ def multiply_matrix_recursive(A, B, C, rowA, colA, rowB, colB, rowC, colC, n):
 def multiply_matrix(A, B, C, n):
     multiply_matrix_recursive(A, B, C, 0, 0, 0, 0, 0, 0, n)
 
-# Test cases
-print("Test case 1:")
-
-matrixA = [
-    [5, 2, 6, 1],
-    [0, 6, 2, 0],
-    [3, 8, 1, 4],
-    [1, 8, 5, 6]
-]
-print("\nMatrix A")
-for row in matrixA:
-    print(row)
-
-matrixB = [
-    [7, 5, 8, 0],
-    [1, 8, 2, 6],
-    [9, 4, 3, 8],
-    [5, 3, 7, 9]
-]
-print("\nMatrix B")
-for row in matrixB:
-    print(row)
-
-n = 4 # 4x4 matrices
-matrixC = [[0 for i in range(n)] for j in range(n)] # Set all elements for matrix C to 0
-
-multiply_matrix(matrixA, matrixB, matrixC, n) # A * B = C
-
-print("\nMatrix C")
-for row in matrixC:
-    print(row)
-
-print("\nTest case 2:") 
-
-n = 16 # 16x16 matrices 
-matrixA = [[i for i in range(n)] for j in range(n)] 
-matrixB = [[i for i in range(n)] for j in range(n)] 
-matrixC = [[0 for i in range(n)] for j in range(n)] # Set all elements for matrix C to 0
-
-print("\nMatrix A")
-for row in matrixA:
-    print(row)
-
-print("\nMatrix B")
-for row in matrixB:
-    print(row)
-
-multiply_matrix(matrixA, matrixB, matrixC, n) # A * B = C
-
-print("\nMatrix C")
-for row in matrixC:
-    print(row)
\ No newline at end of file
+# Function that multiplies two matrices with a tight iterative loop in i-k-j order.
+# Each row of A is combined with whole rows of B, so the innermost loop walks two rows
+# sequentially instead of striding down a column of B. Works on rectangular matrices.
+def multiply_kernel(A, B):
+    cols = len(B[0]) if B else 0
+    C = []
+    for row in A:
+        # Accumulate a_ik * (row k of B) into row i of C
+        C_row = [0] * cols
+        for k, a in enumerate(row):
+            if a != 0: # Skip the zero padding (and any other zeros) entirely
+                C_row = [c + a * b for c, b in zip(C_row, B[k])]
+        C.append(C_row)
+    return C
+
+# Function that returns the element-wise sum of two matrices of the same shape.
+def add_blocks(X, Y):
+    return [[x + y for x, y in zip(X_row, Y_row)] for X_row, Y_row in zip(X, Y)]
+
+# Function that returns the element-wise difference of two matrices of the same shape.
+def subtract_blocks(X, Y):
+    return [[x - y for x, y in zip(X_row, Y_row)] for X_row, Y_row in zip(X, Y)]
+
+# Function that splits a matrix with an even number of rows and columns into its four quadrants.
+def split_blocks(M):
+    half_rows = len(M) // 2
+    half_cols = len(M[0]) // 2
+    top = M[:half_rows]
+    bottom = M[half_rows:]
+    return ([row[:half_cols] for row in top], [row[half_cols:] for row in top],
+            [row[:half_cols] for row in bottom], [row[half_cols:] for row in bottom])
+
+# Helper function to perform Strassen's recursive matrix multiplication.
+# The three dimensions are halved together, so they are padded to multiples of the same
+# power of two (see strassen_padded_shape) and every split is exact.
+def strassen_recursive(A, B, leaf_size):
+    dimensions = (len(A), len(B), len(B[0]))
+    # Base case for when one dimension is small enough for the iterative kernel
+    if min(dimensions) <= leaf_size or any(d % 2 != 0 for d in dimensions):
+        return multiply_kernel(A, B)
+
+    # Divide both matrices into 4 submatrices.
+    A11, A12, A21, A22 = split_blocks(A)
+    B11, B12, B21, B22 = split_blocks(B)
+
+    # 7 recursive products instead of 8
+    M1 = strassen_recursive(add_blocks(A11, A22), add_blocks(B11, B22), leaf_size) # (A11 + A22)(B11 + B22)
+    M2 = strassen_recursive(add_blocks(A21, A22), B11, leaf_size) # (A21 + A22) B11
+    M3 = strassen_recursive(A11, subtract_blocks(B12, B22), leaf_size) # A11 (B12 - B22)
+    M4 = strassen_recursive(A22, subtract_blocks(B21, B11), leaf_size) # A22 (B21 - B11)
+    M5 = strassen_recursive(add_blocks(A11, A12), B22, leaf_size) # (A11 + A12) B22
+    M6 = strassen_recursive(subtract_blocks(A21, A11), add_blocks(B11, B12), leaf_size) # (A21 - A11)(B11 + B12)
+    M7 = strassen_recursive(subtract_blocks(A12, A22), add_blocks(B21, B22), leaf_size) # (A12 - A22)(B21 + B22)
+
+    # C11 = M1 + M4 - M5 + M7
+    C11 = add_blocks(subtract_blocks(add_blocks(M1, M4), M5), M7)
+    # C12 = M3 + M5
+    C12 = add_blocks(M3, M5)
+    # C21 = M2 + M4
+    C21 = add_blocks(M2, M4)
+    # C22 = M1 - M2 + M3 + M6
+    C22 = add_blocks(add_blocks(subtract_blocks(M1, M2), M3), M6)
+
+    # Join the quadrants of C
+    return [left + right for left, right in zip(C11, C12)] + [left + right for left, right in zip(C21, C22)]
+
+# Function that returns the padded dimensions used by Strassen's algorithm for a
+# (rows x inner) times (inner x cols) product. The recursion halves every dimension until
+# the smallest one fits in a leaf, so each dimension is padded on its own to the smallest
+# multiple of 2^levels that is at least that dimension; this adds fewer than 2^levels to each.
+def strassen_padded_shape(rows, inner, cols, leaf_size):
+    levels = 0
+    while -(-min(rows, inner, cols) // (2 ** levels)) > leaf_size:
+        levels += 1
+    block = 2 ** levels
+    return tuple(-(-d // block) * block for d in (rows, inner, cols))
+
+# Function to initiate Strassen's matrix multiplication algorithm (C = C + A * B).
+# Below leaf_size the iterative kernel takes over; n does not need to be a power of two,
+# and the matrices may be rectangular (A is rows x inner, B is inner x cols).
+def multiply_matrix_strassen(A, B, C, leaf_size=128):
+    if leaf_size < 1:
+        raise ValueError("leaf_size must be at least 1")
+    rows = len(A)
+    inner = len(B)
+    cols = len(B[0]) if B else 0
+    if any(len(row) != inner for row in A) or any(len(row) != cols for row in B):
+        raise ValueError("A must be rows x inner and B must be inner x cols")
+    if len(C) != rows or any(len(row) != cols for row in C):
+        raise ValueError("C must be rows x cols")
+    if min(rows, inner, cols) <= leaf_size:
+        # A thin product has nothing to split: the kernel alone does it without padding
+        product = multiply_kernel(A, B)
+    else:
+        padded_rows, padded_inner, padded_cols = strassen_padded_shape(rows, inner, cols, leaf_size)
+        # Pad A with zeros to padded_rows x padded_inner and B to padded_inner x padded_cols
+        A_padded = ([list(row) + [0] * (padded_inner - inner) for row in A]
+                    + [[0] * padded_inner for _ in range(padded_rows - rows)])
+        B_padded = ([list(row) + [0] * (padded_cols - cols) for row in B]
+                    + [[0] * padded_cols for _ in range(padded_inner - inner)])
+        product = strassen_recursive(A_padded, B_padded, leaf_size)
+    # Peel the padding off the result
+    for i in range(rows):
+        for j in range(cols):
+            C[i][j] += product[i][j]
+
+# Function that times Strassen's algorithm for several leaf sizes on this machine
+# and returns the fastest one (the crossover point to the iterative kernel).
+def find_strassen_crossover(n=256, leaf_sizes=(16, 32, 64, 128, 256), seed=0):
+    rng = random.Random(seed)
+    A = [[rng.random() for _ in range(n)] for _ in range(n)]
+    B = [[rng.random() for _ in range(n)] for _ in range(n)]
+    best = None
+    for leaf_size in leaf_sizes:
+        C = [[0 for i in range(n)] for j in range(n)]
+        start = time.perf_counter()
+        multiply_matrix_strassen(A, B, C, leaf_size)
+        elapsed = time.perf_counter() - start
+        print(f"n = {n}, leaf size {leaf_size:4d}: {elapsed:.3f} s")
+        if best is None or elapsed < best[1]:
+            best = (leaf_size, elapsed)
+    print(f"Fastest leaf size: {best[0]}")
+    return best[0]
+
+# The test cases and the crossover search only run when the file is executed directly,
+# since other labs import it.
+if __name__ == "__main__":
+    # Test cases
+    print("Test case 1:")
+
+    matrixA = [
+        [5, 2, 6, 1],
+        [0, 6, 2, 0],
+        [3, 8, 1, 4],
+        [1, 8, 5, 6]
+    ]
+    print("\nMatrix A")
+    for row in matrixA:
+        print(row)
+
+    matrixB = [
+        [7, 5, 8, 0],
+        [1, 8, 2, 6],
+        [9, 4, 3, 8],
+        [5, 3, 7, 9]
+    ]
+    print("\nMatrix B")
+    for row in matrixB:
+        print(row)
+
+    n = 4 # 4x4 matrices
+    matrixC = [[0 for i in range(n)] for j in range(n)] # Set all elements for matrix C to 0
+
+    multiply_matrix(matrixA, matrixB, matrixC, n) # A * B = C
+
+    print("\nMatrix C")
+    for row in matrixC:
+        print(row)
+
+    print("\nTest case 2:")
+
+    n = 16 # 16x16 matrices
+    matrixA = [[i for i in range(n)] for j in range(n)]
+    matrixB = [[i for i in range(n)] for j in range(n)]
+    matrixC = [[0 for i in range(n)] for j in range(n)] # Set all elements for matrix C to 0
+
+    print("\nMatrix A")
+    for row in matrixA:
+        print(row)
+
+    print("\nMatrix B")
+    for row in matrixB:
+        print(row)
+
+    multiply_matrix(matrixA, matrixB, matrixC, n) # A * B = C
+
+    print("\nMatrix C")
+    for row in matrixC:
+        print(row)
+
+    print("\nTest case 3:")
+
+    n = 6 # 6x6 matrices (not a power of two)
+    matrixA = [[i + j for i in range(n)] for j in range(n)]
+    matrixB = [[i * j % 5 for i in range(n)] for j in range(n)]
+    matrixC = [[0 for i in range(n)] for j in range(n)] # Set all elements for matrix C to 0
+
+    multiply_matrix_strassen(matrixA, matrixB, matrixC, leaf_size=2) # A * B = C using Strassen's algorithm
+
+    print("\nMatrix C")
+    for row in matrixC:
+        print(row)
+
+    print("\nTest case 4:")
+
+    # 5x7 times 7x3 (rectangular: each dimension is padded on its own)
+    matrixA = [[(i + 2 * j) % 4 for i in range(7)] for j in range(5)]
+    matrixB = [[i - j for i in range(3)] for j in range(7)]
+    matrixC = [[0 for i in range(3)] for j in range(5)]
+
+    multiply_matrix_strassen(matrixA, matrixB, matrixC, leaf_size=2)
+
+    print("\nMatrix C")
+    for row in matrixC:
+        print(row)
+    print("Same as the iterative kernel:", matrixC == multiply_kernel(matrixA, matrixB))
+
+    # Mismatched inner dimensions are rejected
+    try:
+        multiply_matrix_strassen(matrixA, matrixA, matrixC)
+    except ValueError as error:
+        print("5x7 times 5x7:", error)
+
+    print("\nStrassen crossover:")
+    find_strassen_crossover(n=128, leaf_sizes=(8, 16, 32, 64, 128))
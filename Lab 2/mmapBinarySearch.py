@@ -0,0 +1,154 @@
+# Implementation for binary search over a memory-mapped file of sorted fixed-width records
+
+import bisect
+import mmap
+import os
+import struct
+import tempfile
+
+# Class that gives zero-copy, array-like access to a file of sorted fixed-width records.
+# The file is memory-mapped, so only the pages touched by a search are read from disk.
+# A small in-memory sparse index holds the key of every sparse_every-th record; a
+# lookup binary searches the sparse index first and then only one block of the file,
+# which keeps the number of page faults per lookup small and constant. The sparse index
+# is built by the first lookup, so opening a file does not touch its pages.
+class RecordFile:
+    def __init__(self, path, record_size, key_format=">q", key_offset=0, sparse_every=None):
+        # Struct that decodes the key of a record (the first field of key_format)
+        self.key_struct = struct.Struct(key_format)
+        if key_offset + self.key_struct.size > record_size:
+            raise ValueError("the key does not fit inside a record")
+        self.record_size = record_size
+        self.key_offset = key_offset
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        if size % record_size != 0:
+            self.file.close()
+            raise ValueError("file size is not a multiple of the record size")
+        self.n = size // record_size # Number of records
+        self.map = None
+        self.view = None
+        if self.n > 0:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self.map)
+        # By default sample one key per 64 KB of file
+        if sparse_every is None:
+            sparse_every = max(1, (64 * 1024) // record_size)
+        self.sparse_every = sparse_every
+        self.sparse_keys = None # Built by the first lookup
+
+    # Method that gives the kernel an madvise hint about the access pattern, where supported
+    def advise(self, name):
+        if self.map is not None and hasattr(self.map, "madvise") and hasattr(mmap, name):
+            self.map.madvise(getattr(mmap, name))
+
+    # Method that returns the sparse index, building it on the first call
+    def sparse_index(self):
+        if self.sparse_keys is None:
+            # The scan walks the whole file in order, so it keeps the default read-ahead
+            self.sparse_keys = [self.key(i) for i in range(0, self.n, self.sparse_every)]
+            # Searches jump around the file, so from now on read-ahead would mostly load unused pages
+            self.advise("MADV_RANDOM")
+        return self.sparse_keys
+
+    # Method that returns the number of records in the file
+    def __len__(self):
+        return self.n
+
+    # Method that returns the key of record i
+    def key(self, i):
+        return self.key_struct.unpack_from(self.view, i * self.record_size + self.key_offset)[0]
+
+    # Method that returns record i as a zero-copy memoryview
+    # (views still in use when the file is closed make close() raise BufferError)
+    def record(self, i):
+        start = i * self.record_size
+        return self.view[start:start + self.record_size]
+
+    # Method that returns the first record index whose key is not less than target
+    def lower_bound(self, target):
+        # Find the block of the file that contains the answer using the sparse index
+        block = bisect.bisect_left(self.sparse_index(), target)
+        if block == 0:
+            low = 0
+            high = 0
+        else:
+            # Keys before the sampled key of the previous block are all smaller than target
+            low = (block - 1) * self.sparse_every + 1
+            high = min(block * self.sparse_every, self.n)
+        # Binary search the records inside the block
+        while low < high:
+            mid = low + (high - low) // 2
+            if self.key(mid) < target:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    # Method that returns the first record index whose key is greater than target
+    def upper_bound(self, target):
+        block = bisect.bisect_right(self.sparse_index(), target)
+        if block == 0:
+            low = 0
+            high = 0
+        else:
+            low = (block - 1) * self.sparse_every + 1
+            high = min(block * self.sparse_every, self.n)
+        while low < high:
+            mid = low + (high - low) // 2
+            if self.key(mid) <= target:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    # Method that returns the index of the first record with the target key, or -1
+    def search(self, target):
+        i = self.lower_bound(target)
+        if i < self.n and self.key(i) == target:
+            return i
+        return -1
+
+    # Method that yields the index and a zero-copy view of every record with lo <= key < hi
+    def range(self, lo, hi):
+        i = self.lower_bound(lo)
+        # The records are sorted, so the range is a contiguous run of records
+        while i < self.n and self.key(i) < hi:
+            yield i, self.record(i)
+            i = i + 1
+
+    # Method that unmaps and closes the file
+    def close(self):
+        if self.view is not None:
+            self.view.release()
+            self.view = None
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Test case 1
+with tempfile.TemporaryDirectory() as work_dir:
+    path = os.path.join(work_dir, "records.bin")
+    # Records of 16 bytes: a big-endian 64-bit key followed by a 64-bit payload
+    record = struct.Struct(">qq")
+    with open(path, "wb") as f:
+        for key in range(0, 200000, 2):
+            f.write(record.pack(key, key * 10))
+
+    with RecordFile(path, record.size, sparse_every=256) as records:
+        print(f"Records in file: {len(records)}, sparse index built on open: {records.sparse_keys is not None}")
+        for target in [4242, 4243, 0, 199998, 200000]:
+            i = records.search(target)
+            if i != -1:
+                print(f"Key {target} found at record {i} with payload {record.unpack(records.record(i))[1]}")
+            else:
+                print(f"Key {target} is not present in the file")
+        print(f"Sparse index entries after the searches: {len(records.sparse_keys)}")
+        print("Keys in [100, 110):", [record.unpack(r)[0] for _, r in records.range(100, 110)])
@@ -0,0 +1,142 @@
+# Implementation for the parallel recursive matrix multiplication algorithm over shared memory.
+
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from flatMatrix import Matrix, multiply_recursive
+
+# Function that copies a matrix into a new shared memory block and returns the block.
+def to_shared(M):
+    shm = shared_memory.SharedMemory(create=True, size=max(M.rows * M.cols, 1) * 8)
+    view = shm.buf.cast("d")
+    try:
+        for i in range(M.rows):
+            view[i * M.cols:(i + 1) * M.cols] = array("d", M.row(i))
+    finally:
+        view.release()
+    return shm
+
+# Function that computes one block of C = A * B in place (runs in a worker process).
+# The block is C[row..row+rows-1][col..col+cols-1], which only needs the matching row
+# band of A and column band of B; no other task writes to the same block of C.
+def multiply_block(names, n_rows, n_inner, n_cols, row, col, rows, cols, leaf_size):
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    views = [shm.buf.cast("d") for shm in blocks]
+    try:
+        A = Matrix(n_rows, n_inner, views[0])
+        B = Matrix(n_inner, n_cols, views[1])
+        C = Matrix(n_rows, n_cols, views[2])
+        multiply_recursive(A.view(row, 0, rows, n_inner), B.view(0, col, n_inner, cols),
+                           C.view(row, col, rows, cols), leaf_size)
+        # Drop the matrices so that nothing refers to the views any more
+        del A, B, C
+    finally:
+        for view in views:
+            view.release()
+        for shm in blocks:
+            shm.close()
+
+# Function that splits C into the blocks handed to the workers.
+# Each level of the recursion splits every block into its four quadrants; the two
+# products that add into the same quadrant of C stay in one task, so no two workers
+# ever write to the same element of C.
+def spawn_blocks(rows, cols, spawn_depth):
+    blocks = [(0, 0, rows, cols)]
+    for _ in range(spawn_depth):
+        next_blocks = []
+        for row, col, r, c in blocks:
+            top = r // 2
+            left = c // 2
+            for q_row, q_rows in ((row, top), (row + top, r - top)):
+                for q_col, q_cols in ((col, left), (col + left, c - left)):
+                    if q_rows > 0 and q_cols > 0:
+                        next_blocks.append((q_row, q_col, q_rows, q_cols))
+        blocks = next_blocks
+    return blocks
+
+# Function to initiate the parallel matrix multiplication algorithm (returns A * B).
+# The operands and the result live in shared memory, the top spawn_depth levels of the
+# recursion are handed to a process pool (4^spawn_depth tasks), and every worker runs
+# the recursive multiplication on views of the shared buffers and writes its quadrant
+# of C in place, so no matrix data is pickled.
+def parallel_multiply(A, B, workers=None, spawn_depth=1, leaf_size=32, executor=None):
+    if A.cols != B.rows:
+        raise ValueError("matrix dimensions do not match")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    shared = [to_shared(A), to_shared(B),
+              shared_memory.SharedMemory(create=True, size=max(A.rows * B.cols, 1) * 8)]
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # The new shared memory block is zero-filled, so C starts as the zero matrix
+        names = [shm.name for shm in shared]
+        futures = [executor.submit(multiply_block, names, A.rows, A.cols, B.cols,
+                                   row, col, rows, cols, leaf_size)
+                   for row, col, rows, cols in spawn_blocks(A.rows, B.cols, spawn_depth)]
+        for future in futures:
+            future.result()
+        # Copy the result out of shared memory
+        data = array("d")
+        data.frombytes(shared[2].buf[:A.rows * B.cols * 8])
+        C = Matrix(A.rows, B.cols, data)
+    finally:
+        if own_executor:
+            executor.shutdown()
+        for shm in shared:
+            shm.close()
+            shm.unlink()
+    return C
+
+# Function that measures how the parallel multiplication scales from 1 to max_workers workers.
+def benchmark_scaling(n, max_workers=None, spawn_depth=1, leaf_size=32, seed=0):
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    rng = random.Random(seed)
+    A = Matrix(n, n, array("d", [rng.random() for _ in range(n * n)]))
+    B = Matrix(n, n, array("d", [rng.random() for _ in range(n * n)]))
+
+    # Time the serial recursive multiplication as the baseline
+    start = time.perf_counter()
+    expected = Matrix(n, n)
+    multiply_recursive(A, B, expected, leaf_size)
+    serial_time = time.perf_counter() - start
+    print(f"n = {n}, serial: {serial_time:.3f} s")
+
+    for workers in range(1, max_workers + 1):
+        # Start the pool before timing so that process startup is not measured
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            start = time.perf_counter()
+            C = parallel_multiply(A, B, workers, spawn_depth, leaf_size, executor)
+            elapsed = time.perf_counter() - start
+        assert C.data == expected.data
+        print(f"workers = {workers:2d}: {elapsed:.3f} s, speedup {serial_time / elapsed:.2f}x")
+
+# The process pool re-imports this module in the workers on some platforms,
+# so the test cases only run when the file is executed directly.
+if __name__ == "__main__":
+    # Test case 1
+    matrixA = Matrix.from_lists([
+        [5, 2, 6, 1],
+        [0, 6, 2, 0],
+        [3, 8, 1, 4],
+        [1, 8, 5, 6]
+    ])
+    matrixB = Matrix.from_lists([
+        [7, 5, 8, 0],
+        [1, 8, 2, 6],
+        [9, 4, 3, 8],
+        [5, 3, 7, 9]
+    ])
+    print("Matrix C = A * B")
+    for row in parallel_multiply(matrixA, matrixB, workers=4, spawn_depth=1, leaf_size=1).to_lists():
+        print(row)
+
+    # Benchmark
+    print()
+    benchmark_scaling(128, max_workers=min(os.cpu_count() or 1, 8), spawn_depth=2)
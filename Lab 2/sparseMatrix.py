@@ -0,0 +1,192 @@
+# Implementation for sparse matrices in compressed sparse row (CSR) format and their multiplication.
+
+import random
+from array import array
+
+from matrixMultiplication import multiply_matrix
+
+# Sparse matrix class in compressed sparse row (CSR) format.
+# The nonzeros of row i are values[indptr[i]:indptr[i + 1]], in the columns
+# indices[indptr[i]:indptr[i + 1]] (sorted in ascending order). The CSR arrays of
+# the transpose are the compressed sparse column (CSC) arrays of the matrix.
+class CSRMatrix:
+    def __init__(self, rows, cols, indptr, indices, values):
+        self.rows = rows
+        self.cols = cols
+        self.indptr = indptr # array('q') of rows + 1 row start positions
+        self.indices = indices # array('q') with the column of every nonzero
+        self.values = values # List with the value of every nonzero
+
+    # Method that creates a sparse matrix from a dense list of lists
+    @classmethod
+    def from_dense(cls, dense):
+        rows = len(dense)
+        cols = len(dense[0]) if rows else 0
+        indptr = array("q", [0])
+        indices = array("q")
+        values = []
+        for row in dense:
+            # Keep only the nonzero elements of the row
+            for j, x in enumerate(row):
+                if x != 0:
+                    indices.append(j)
+                    values.append(x)
+            indptr.append(len(values))
+        return cls(rows, cols, indptr, indices, values)
+
+    # Method that creates a sparse matrix from coordinate (COO) triples (i, j, value).
+    # Duplicate coordinates are added together, like repeated += into a dense matrix.
+    @classmethod
+    def from_coo(cls, rows, cols, triples):
+        # Count the entries of every row (counting sort by row)
+        counts = [0] * (rows + 1)
+        triples = list(triples)
+        for i, j, _ in triples:
+            if not (0 <= i < rows and 0 <= j < cols):
+                raise IndexError("coordinate out of range")
+            counts[i + 1] += 1
+        for i in range(rows):
+            counts[i + 1] += counts[i]
+        # Place every entry in its row
+        row_cols = [0] * len(triples)
+        row_values = [0] * len(triples)
+        next_slot = counts[:-1]
+        for i, j, x in triples:
+            row_cols[next_slot[i]] = j
+            row_values[next_slot[i]] = x
+            next_slot[i] += 1
+        # Sort each row by column and add up duplicates
+        indptr = array("q", [0])
+        indices = array("q")
+        values = []
+        for i in range(rows):
+            entries = sorted(zip(row_cols[counts[i]:counts[i + 1]], row_values[counts[i]:counts[i + 1]]),
+                             key=lambda entry: entry[0])
+            for j, x in entries:
+                if len(values) > indptr[-1] and indices[-1] == j:
+                    values[-1] += x
+                else:
+                    indices.append(j)
+                    values.append(x)
+            indptr.append(len(values))
+        return cls(rows, cols, indptr, indices, values)
+
+    # Method that returns the matrix as a dense list of lists
+    def to_dense(self):
+        dense = [[0] * self.cols for _ in range(self.rows)]
+        for i in range(self.rows):
+            for p in range(self.indptr[i], self.indptr[i + 1]):
+                dense[i][self.indices[p]] = self.values[p]
+        return dense
+
+    # Method that returns the number of stored nonzeros
+    def nnz(self):
+        return len(self.values)
+
+    # Method that returns the transpose (equivalently, the CSC form of this matrix)
+    def transpose(self):
+        # Count the nonzeros of every column
+        indptr = array("q", [0]) * (self.cols + 1)
+        for j in self.indices:
+            indptr[j + 1] += 1
+        for j in range(self.cols):
+            indptr[j + 1] += indptr[j]
+        indices = array("q", [0]) * self.nnz()
+        values = [0] * self.nnz()
+        next_slot = array("q", indptr[:-1])
+        # Visiting the rows in order keeps the row indices of every column sorted
+        for i in range(self.rows):
+            for p in range(self.indptr[i], self.indptr[i + 1]):
+                j = self.indices[p]
+                indices[next_slot[j]] = i
+                values[next_slot[j]] = self.values[p]
+                next_slot[j] += 1
+        return CSRMatrix(self.cols, self.rows, indptr, indices, values)
+
+    # Method that multiplies with a sparse matrix (A @ B) or a dense list of lists
+    def __matmul__(self, other):
+        if isinstance(other, CSRMatrix):
+            return multiply_sparse(self, other)
+        return multiply_sparse_dense(self, other)
+
+# Function that multiplies two sparse matrices with Gustavson's row-wise algorithm.
+# Row i of C is the sum of a_ik * (row k of B) over the nonzeros a_ik of row i of A,
+# accumulated in a dense scratch row, so the cost is proportional to the number of
+# multiply-adds actually needed rather than to n^3.
+def multiply_sparse(A, B):
+    if A.cols != B.rows:
+        raise ValueError("matrix dimensions do not match")
+    accumulator = [0] * B.cols # Dense scratch row
+    occupied = [False] * B.cols # Columns of the scratch row used by the current row
+    indptr = array("q", [0])
+    indices = array("q")
+    values = []
+    A_indptr, A_indices, A_values = A.indptr, A.indices, A.values
+    B_indptr, B_indices, B_values = B.indptr, B.indices, B.values
+    for i in range(A.rows):
+        touched = []
+        # Accumulate a_ik * (row k of B) for every nonzero of row i of A
+        for p in range(A_indptr[i], A_indptr[i + 1]):
+            k = A_indices[p]
+            a = A_values[p]
+            for q in range(B_indptr[k], B_indptr[k + 1]):
+                j = B_indices[q]
+                if not occupied[j]:
+                    occupied[j] = True
+                    touched.append(j)
+                    accumulator[j] = a * B_values[q]
+                else:
+                    accumulator[j] += a * B_values[q]
+        # Gather the row in column order and reset the scratch row
+        touched.sort()
+        for j in touched:
+            if accumulator[j] != 0: # Skip entries that cancelled out
+                indices.append(j)
+                values.append(accumulator[j])
+            occupied[j] = False
+        indptr.append(len(values))
+    return CSRMatrix(A.rows, B.cols, indptr, indices, values)
+
+# Function that multiplies a sparse matrix by a dense list of lists and returns a dense result.
+def multiply_sparse_dense(A, D):
+    if A.cols != len(D):
+        raise ValueError("matrix dimensions do not match")
+    cols = len(D[0]) if D else 0
+    C = []
+    for i in range(A.rows):
+        C_row = [0] * cols
+        # Only the rows of D that meet a nonzero of row i of A are read
+        for p in range(A.indptr[i], A.indptr[i + 1]):
+            a = A.values[p]
+            C_row = [c + a * d for c, d in zip(C_row, D[A.indices[p]])]
+        C.append(C_row)
+    return C
+
+# Test case 1
+matrixA = [
+    [5, 0, 0, 1],
+    [0, 6, 0, 0],
+    [0, 0, 0, 4],
+    [1, 0, 5, 0]
+]
+sparseA = CSRMatrix.from_dense(matrixA)
+print("CSR arrays of matrix A:")
+print("indptr:", sparseA.indptr.tolist())
+print("indices:", sparseA.indices.tolist())
+print("values:", sparseA.values)
+
+sparseB = CSRMatrix.from_coo(4, 4, [(0, 0, 7), (1, 1, 8), (2, 3, 8), (3, 0, 5), (3, 3, 9), (3, 3, 1)])
+print("\nMatrix C = A * B")
+for row in (sparseA @ sparseB).to_dense():
+    print(row)
+
+# Test case 2
+n = 16 # 16x16 matrices with about 5% nonzeros
+rng = random.Random(1)
+matrixA = [[rng.randint(1, 9) if rng.random() < 0.05 else 0 for i in range(n)] for j in range(n)]
+matrixB = [[rng.randint(1, 9) if rng.random() < 0.05 else 0 for i in range(n)] for j in range(n)]
+matrixC = [[0 for i in range(n)] for j in range(n)]
+multiply_matrix(matrixA, matrixB, matrixC, n) # Dense path
+sparseC = CSRMatrix.from_dense(matrixA) @ CSRMatrix.from_dense(matrixB)
+print("\nSparse result matches the dense path:", sparseC.to_dense() == matrixC)
+print("Sparse times dense matches the dense path:", CSRMatrix.from_dense(matrixA) @ matrixB == matrixC)
@@ -0,0 +1,209 @@
+# Implementation for cache-friendly static search indexes (Eytzinger and implicit B-tree layouts)
+
+import bisect
+import random
+import time
+from array import array
+
+import binarySearch as search
+
+# Function that returns the typed array code for the keys of an index.
+def key_typecode(sorted_keys):
+    if all(type(x) is int for x in sorted_keys):
+        return "q" # 64-bit signed integers
+    return "d" # 64-bit floats
+
+# Function that returns the key used to pad the unused slots of an index.
+# It is not smaller than any real key, so searches never stop at a padding slot early.
+def padding_key(typecode):
+    return 2**63 - 1 if typecode == "q" else float("inf")
+
+# Static index that stores a sorted array in Eytzinger (BFS) order.
+# Slot 1 holds the root and slot k has children 2k and 2k + 1, so the first
+# levels of every search share the same few cache lines, and the next slots to
+# be read are always close together.
+class EytzingerIndex:
+    def __init__(self, sorted_keys):
+        sorted_keys = list(sorted_keys)
+        n = len(sorted_keys)
+        self.n = n
+        typecode = key_typecode(sorted_keys)
+        # Slot 0 is unused so that the children of slot k are 2k and 2k + 1
+        self.keys = array(typecode, [0]) * (n + 1)
+        self.ranks = array("q", [0]) * (n + 1) # Sorted index of the key in each slot
+        # Visit the slots in order (an in-order walk of the implicit tree) and fill
+        # them with the sorted keys one by one
+        k = 1
+        i = 0
+        if n > 0:
+            # Start at the leftmost slot
+            while 2 * k <= n:
+                k = 2 * k
+        while k != 0 and i < n:
+            self.keys[k] = sorted_keys[i]
+            self.ranks[k] = i
+            i = i + 1
+            # Move to the in-order successor slot
+            if 2 * k + 1 <= n:
+                k = 2 * k + 1
+                while 2 * k <= n:
+                    k = 2 * k
+            else:
+                # Climb while k is a right child, then once more to the parent
+                while k & 1:
+                    k = k >> 1
+                k = k >> 1
+
+    # Method that returns the number of keys in the index
+    def __len__(self):
+        return self.n
+
+    # Method that returns the slot of the first key not less than target (0 if there is none)
+    def lower_bound_slot(self, target):
+        keys = self.keys
+        n = self.n
+        k = 1
+        # Descend to a leaf without branching on the comparison:
+        # go right (2k + 1) when the key is smaller than the target, left (2k) otherwise
+        while k <= n:
+            k = 2 * k + (keys[k] < target)
+        # Undo the trailing right turns and the last left turn to reach the answer slot
+        return k >> ((~k & (k + 1)).bit_length())
+
+    # Method that returns the first sorted index whose key is not less than target
+    def lower_bound(self, target):
+        k = self.lower_bound_slot(target)
+        return self.ranks[k] if k != 0 else self.n
+
+    # Method that returns the sorted index of target, or -1 if it is not in the index
+    def search(self, target):
+        k = self.lower_bound_slot(target)
+        if k != 0 and self.keys[k] == target:
+            return self.ranks[k]
+        return -1
+
+    # Method that checks whether target is in the index
+    def __contains__(self, target):
+        return self.search(target) != -1
+
+# Static index that stores a sorted array as an implicit B-tree.
+# Each node is a block of block_size sorted keys stored next to each other, and
+# node k has children k * (block_size + 1) + 1 ... k * (block_size + 1) + block_size + 1.
+# A search reads one block per level, so it touches log_(B+1)(n) cache lines
+# instead of log2(n), and the search inside a block is a single bisect call.
+class BTreeIndex:
+    def __init__(self, sorted_keys, block_size=16):
+        sorted_keys = list(sorted_keys)
+        n = len(sorted_keys)
+        self.n = n
+        self.block_size = block_size
+        typecode = key_typecode(sorted_keys)
+        self.blocks = (n + block_size - 1) // block_size # Number of nodes
+        slots = self.blocks * block_size
+        self.keys = array(typecode, [padding_key(typecode)]) * slots
+        self.ranks = array("q", [n]) * slots # Sorted index of each key (n for padding)
+        # Fill the blocks in order with an explicit stack: a (node, j) entry means that
+        # the subtrees before key j of the node have been filled
+        i = 0
+        stack = [(0, 0)]
+        while stack:
+            node, j = stack.pop()
+            if node >= self.blocks:
+                continue
+            if 0 < j <= block_size:
+                # Subtree j - 1 is done, so key j - 1 of the node comes next
+                if i < n:
+                    self.keys[node * block_size + j - 1] = sorted_keys[i]
+                    self.ranks[node * block_size + j - 1] = i
+                    i = i + 1
+            if j <= block_size:
+                # Come back for key j after filling child j
+                stack.append((node, j + 1))
+                stack.append((node * (block_size + 1) + j + 1, 0))
+
+    # Method that returns the number of keys in the index
+    def __len__(self):
+        return self.n
+
+    # Method that returns the first sorted index whose key is not less than target
+    def lower_bound(self, target):
+        keys = self.keys
+        B = self.block_size
+        answer = self.n
+        node = 0
+        # Descend one block per level
+        while node < self.blocks:
+            start = node * B
+            # Position of the first key in the block not less than the target
+            j = bisect.bisect_left(keys, target, start, start + B)
+            if j < start + B:
+                answer = self.ranks[j]
+            node = node * (B + 1) + (j - start) + 1
+        return answer
+
+    # Method that returns the sorted index of target, or -1 if it is not in the index
+    def search(self, target):
+        keys = self.keys
+        B = self.block_size
+        node = 0
+        while node < self.blocks:
+            start = node * B
+            j = bisect.bisect_left(keys, target, start, start + B)
+            # Check if the target is in this block
+            if j < start + B and keys[j] == target and self.ranks[j] < self.n:
+                return self.ranks[j]
+            node = node * (B + 1) + (j - start) + 1
+        return -1
+
+    # Method that checks whether target is in the index
+    def __contains__(self, target):
+        return self.search(target) != -1
+
+# Function that compares the static indexes with the binary search of binarySearch.py.
+# Sizes up to 1e8 need several GB of memory and a long build, so the size list is a parameter.
+def benchmark_static_index(sizes, queries=100000, seed=0):
+    rng = random.Random(seed)
+    for n in sizes:
+        sorted_keys = array("q", range(0, 2 * n, 2)) # Even numbers: half the queries miss
+        targets = [rng.randrange(2 * n) for _ in range(queries)]
+        start = time.perf_counter()
+        eytzinger = EytzingerIndex(sorted_keys)
+        eytzinger_build = time.perf_counter() - start
+        start = time.perf_counter()
+        btree = BTreeIndex(sorted_keys)
+        btree_build = time.perf_counter() - start
+        print(f"n = {n}: build Eytzinger {eytzinger_build:.2f} s, B-tree {btree_build:.2f} s")
+
+        # (name, search function) pairs that all return the index or -1
+        searches = [
+            ("binary_search_recursive", lambda x: search.binary_search_recursive(sorted_keys, 0, n - 1, x)),
+            ("binary_search", lambda x: search.binary_search(sorted_keys, n, x)),
+            ("EytzingerIndex.search", eytzinger.search),
+            ("BTreeIndex.search", btree.search),
+        ]
+        expected = None
+        for name, find in searches:
+            start = time.perf_counter()
+            results = [find(x) for x in targets]
+            elapsed = time.perf_counter() - start
+            if expected is None:
+                expected = results
+            assert results == expected
+            print(f"{name:>25}: {elapsed / queries * 1e9:8.0f} ns per lookup")
+
+# Test case 1
+keys1 = [3, 5, 7, 8, 9, 12, 15, 20, 21, 30]
+index1 = EytzingerIndex(keys1)
+print(f"Eytzinger layout of {keys1}: {index1.keys.tolist()[1:]}")
+print(f"Search for 12: index {index1.search(12)}, search for 10: index {index1.search(10)}")
+print(f"Lower bound of 10: {index1.lower_bound(10)}, of 31: {index1.lower_bound(31)}\n")
+
+# Test case 2
+index2 = BTreeIndex(keys1, block_size=3)
+print(f"B-tree layout of {keys1} with blocks of 3: {index2.keys.tolist()}")
+print(f"Search for 21: index {index2.search(21)}, search for 4: index {index2.search(4)}")
+print(f"Lower bound of 4: {index2.lower_bound(4)}, of 31: {index2.lower_bound(31)}\n")
+
+# Benchmark against binary search, only when this file is executed directly
+if __name__ == "__main__":
+    benchmark_static_index([10**5])
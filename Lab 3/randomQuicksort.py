@@ -1,6 +1,9 @@
 # Implementation for randomized quicksort algorithm
 
+import math
 import random
+import time
+from fractions import Fraction
 
 # Function that rearranges elements in an array between two sides of a pivot.
 def Partition(A, p, r):
@@ -41,6 +44,275 @@ def Randomized_Quicksort(A, p, r):
         Randomized_Quicksort(A, p, q - 1)
         Randomized_Quicksort(A, q + 1, r)
 
+# Function that rearranges elements in an array into three groups around a pivot:
+# elements smaller than, equal to and greater than the pivot (Dutch national flag).
+# Returns the indices of the first and last elements equal to the pivot.
+def Three_Way_Partition(A, p, r):
+    x = A[r] # Pivot
+    lt = p # Next index of the low side
+    i = p # Next element to be examined
+    gt = r # Last index not yet on the high side
+    # Iterate until every element has been placed in a group
+    while i <= gt:
+        # Check if element belongs on the low side
+        if A[i] < x:
+            # Swap A[lt] with A[i]
+            temp = A[lt]
+            A[lt] = A[i]
+            A[i] = temp
+            lt = lt + 1
+            i = i + 1
+        # Check if element belongs on the high side
+        elif A[i] > x:
+            # Swap A[i] with A[gt]; the swapped in element is examined next
+            temp = A[gt]
+            A[gt] = A[i]
+            A[i] = temp
+            gt = gt - 1
+        # Element is equal to the pivot and stays in the middle
+        else:
+            i = i + 1
+    # A[lt..gt] holds every element equal to the pivot
+    return lt, gt
+
+# Function that randomly selects a pivot and initiates Three_Way_Partition.
+def Randomized_Three_Way_Partition(A, p, r):
+    # Randomly select a pivot
+    i = random.randint(p, r)
+    # Swap A[r] with A[i]
+    temp = A[r]
+    A[r] = A[i]
+    A[i] = temp
+    return Three_Way_Partition(A, p, r)
+
+# Function that sorts an array using randomized quicksort with three-way partitioning.
+# Elements equal to the pivot are never recursed into, so arrays with many
+# duplicate keys are sorted in O(n log k) time for k distinct keys. Only the
+# smaller side is recursed into, which keeps the stack depth within log2(n).
+def Randomized_Quicksort_Three_Way(A, p, r):
+    while p < r:
+        lt, gt = Randomized_Three_Way_Partition(A, p, r)
+        # Recurse into the smaller side and continue with the larger side
+        if lt - p < r - gt:
+            Randomized_Quicksort_Three_Way(A, p, lt - 1)
+            p = gt + 1
+        else:
+            Randomized_Quicksort_Three_Way(A, gt + 1, r)
+            r = lt - 1
+
+# Function that rearranges A[p..r] so that A[k] holds the element that would be
+# at index k if A[p..r] were sorted, with smaller or equal elements before it and
+# greater or equal elements after it. Randomized_Partition is used while the work
+# done stays within a linear budget; past that, the median-of-medians selection
+# takes over, so the running time is expected and worst-case linear.
+def Randomized_Select(A, p, r, k):
+    # Total number of elements the randomized partitions may examine
+    budget = 8 * (r - p + 1)
+    while p < r:
+        # Check if the random pivots have been unlucky for too long
+        if budget <= 0:
+            Select_Linear(A, p, r, k)
+            return
+        budget = budget - (r - p + 1)
+        q = Randomized_Partition(A, p, r)
+        # Continue only on the side that contains index k
+        if k == q:
+            return
+        elif k < q:
+            r = q - 1
+        else:
+            p = q + 1
+
+# Function that rearranges A[p..r] like Randomized_Select, using the median of
+# medians of groups of five as the pivot, which guarantees a linear running time.
+def Select_Linear(A, p, r, k):
+    while r - p + 1 > 5:
+        # Sort every group of five and move its median to the front of A[p..r]
+        g = 0 # Number of group medians moved so far
+        for j in range(p, r + 1, 5):
+            last = min(j + 4, r)
+            Insertion_Sort_Range(A, j, last)
+            m = (j + last) // 2
+            # Swap the median of the group with A[p + g]
+            temp = A[p + g]
+            A[p + g] = A[m]
+            A[m] = temp
+            g = g + 1
+        # Recursively find the median of the group medians
+        mid = p + (g - 1) // 2
+        Select_Linear(A, p, p + g - 1, mid)
+        # Use the median of medians as the pivot: swap A[mid] with A[r]
+        temp = A[r]
+        A[r] = A[mid]
+        A[mid] = temp
+        # Three-way partitioning keeps duplicate keys from unbalancing the split
+        lt, gt = Three_Way_Partition(A, p, r)
+        # Continue only on the side that contains index k
+        if k < lt:
+            r = lt - 1
+        elif k > gt:
+            p = gt + 1
+        else:
+            return
+    Insertion_Sort_Range(A, p, r)
+
+# Function that rearranges an array in place so that A[k] is the element that
+# would be at index k in sorted order (0-based), with smaller or equal elements
+# before it and greater or equal elements after it.
+def nth_element(A, k):
+    if not 0 <= k < len(A):
+        raise IndexError("k is out of range")
+    Randomized_Select(A, 0, len(A) - 1, k)
+
+# Function that returns the k-th smallest element of an array (0-based)
+# without modifying the array.
+def select(A, k):
+    B = list(A)
+    nth_element(B, k)
+    return B[k]
+
+# Function that rearranges an array in place so that every index in ks holds the
+# element that would be there in sorted order, and returns those elements.
+# Each selection splits the array and the remaining indices between both sides,
+# so m indices cost O(n log m) instead of m separate selections.
+def multi_select(A, ks):
+    n = len(A)
+    for k in ks:
+        if not 0 <= k < n:
+            raise IndexError("k is out of range")
+    ranks = sorted(set(ks))
+    # Stack of subarrays A[p..r] with the slice ranks[lo..hi-1] of indices inside them
+    stack = [(0, n - 1, 0, len(ranks))]
+    while stack:
+        p, r, lo, hi = stack.pop()
+        if lo >= hi:
+            continue
+        # Select the middle index first; it splits the others between both sides
+        mid = (lo + hi) // 2
+        k = ranks[mid]
+        Randomized_Select(A, p, r, k)
+        stack.append((p, k - 1, lo, mid))
+        stack.append((k + 1, r, mid + 1, hi))
+    return [A[k] for k in ks]
+
+# Function that returns the quantiles qs (for example 0.5, 0.95 and 0.99) of an
+# array using the nearest-rank method, without modifying the array.
+def quantiles(A, qs):
+    n = len(A)
+    if n == 0:
+        raise IndexError("quantiles of an empty array")
+    ks = []
+    for q in qs:
+        if not 0 <= q <= 1:
+            raise ValueError("quantiles must be between 0 and 1")
+        # Nearest rank: the smallest element with at least q * n elements at or below it.
+        # q * n is computed exactly from the decimal value of q, since in floating point
+        # 0.07 * 100 is 7.000000000000001, which would round up to the next rank.
+        ks.append(max(math.ceil(Fraction(str(q)) * n) - 1, 0))
+    return multi_select(list(A), ks)
+
+# Function that compares both quicksort partitioning schemes on arrays with few distinct keys.
+def Benchmark_Low_Cardinality(n, cardinalities, seed=0):
+    rng = random.Random(seed)
+    print(f"{'distinct keys':>13} {'Lomuto (s)':>14} {'three-way (s)':>14}")
+    for k in cardinalities:
+        data = [rng.randrange(k) for _ in range(n)]
+        results = []
+        for sort in (Randomized_Quicksort, Randomized_Quicksort_Three_Way):
+            arr = list(data)
+            start = time.perf_counter()
+            try:
+                sort(arr, 0, len(arr) - 1)
+                results.append(f"{time.perf_counter() - start:.4f}")
+            except RecursionError:
+                # Lomuto partitioning recurses once per duplicate of the pivot
+                results.append("RecursionError")
+        print(f"{k:>13} {results[0]:>14} {results[1]:>14}")
+
+# Partitions with at most this many elements are finished with insertion sort
+INSERTION_SORT_THRESHOLD = 16
+
+# Function that sorts an array using the introsort algorithm.
+# Randomized quicksort is used until the recursion depth passes 2 * log2(n),
+# at which point the remaining partition is sorted with heapsort, and small
+# partitions are finished with insertion sort.
+def Introsort(A):
+    n = len(A)
+    if n < 2:
+        return
+    # Maximum recursion depth before falling back to heapsort
+    depth_limit = 2 * math.floor(math.log2(n))
+    Introsort_Loop(A, 0, n - 1, depth_limit)
+
+# Function that sorts A[p..r] using quicksort with a depth limit.
+# It only recurses into the smaller side of each partition and loops on the
+# larger side, so the stack depth never exceeds log2(n).
+def Introsort_Loop(A, p, r, depth_limit):
+    # Loop while the partition is too large for insertion sort
+    while r - p + 1 > INSERTION_SORT_THRESHOLD:
+        # Check if quicksort has recursed too deep
+        if depth_limit == 0:
+            Heapsort_Range(A, p, r)
+            return
+        depth_limit = depth_limit - 1
+        q = Randomized_Partition(A, p, r)
+        # Recurse into the smaller side and continue with the larger side
+        if q - p < r - q:
+            Introsort_Loop(A, p, q - 1, depth_limit)
+            p = q + 1
+        else:
+            Introsort_Loop(A, q + 1, r, depth_limit)
+            r = q - 1
+    Insertion_Sort_Range(A, p, r)
+
+# Function that sorts A[p..r] using the insertion sort algorithm.
+def Insertion_Sort_Range(A, p, r):
+    # Iterate through the partition starting from the second element
+    for i in range(p + 1, r + 1):
+        key = A[i]
+        j = i - 1
+        # Shift the elements greater than the key to the right by one position
+        while j >= p and A[j] > key:
+            A[j + 1] = A[j]
+            j = j - 1
+        # Insert the key at its correct position
+        A[j + 1] = key
+
+# Function that maintains the max-heap property of the heap stored in A[p..p+heap_size-1].
+def Max_Heapify_Range(A, p, i, heap_size):
+    # Sift the element down iteratively until it is larger than both children
+    while True:
+        left = 2 * i + 1 # left child
+        right = 2 * i + 2 # right child
+        largest = i
+        if left < heap_size and A[p + left] > A[p + largest]:
+            largest = left
+        if right < heap_size and A[p + right] > A[p + largest]:
+            largest = right
+        # Check if the parent is already the largest element
+        if largest == i:
+            return
+        # Swap the parent with its largest child
+        temp = A[p + i]
+        A[p + i] = A[p + largest]
+        A[p + largest] = temp
+        i = largest
+
+# Function that sorts A[p..r] using the heapsort algorithm.
+def Heapsort_Range(A, p, r):
+    heap_size = r - p + 1
+    # Build a max-heap from the last non-leaf node to the root node
+    for i in range(heap_size // 2 - 1, -1, -1):
+        Max_Heapify_Range(A, p, i, heap_size)
+    # Iterate through the heap from the last element to the second element
+    for i in range(heap_size - 1, 0, -1):
+        # Move the largest element to the last position of the heap
+        temp = A[p]
+        A[p] = A[p + i]
+        A[p + i] = temp
+        # Restore the max-heap property on the remaining elements
+        Max_Heapify_Range(A, p, 0, i)
+
 # Test Case 1
 arr1 = [2, 1, 7, 8, 3, 5, 6, 4]
 print('Original Array:', arr1)
@@ -51,4 +323,36 @@ print('Sorted Array:', arr1, '\n')
 arr2 = [12, 11, 13, 5, 6, 7, 1, 3, 4, 9, 8, 10, 2, 15, 14]
 print('Original Array:', arr2)
 Randomized_Quicksort(arr2, 0, len(arr2) - 1)
-print('Sorted Array:', arr2)
+print('Sorted Array:', arr2, '\n')
+
+# Test Case 3
+arr3 = [5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 1, 9, 3, 7, 2]
+print('Original Array:', arr3)
+Introsort(arr3)
+print('Sorted Array:', arr3, '\n')
+
+# Test Case 4
+arr4 = [3, 1, 3, 2, 1, 3, 3, 2, 1, 1, 2, 3, 2, 1, 3]
+print('Original Array:', arr4)
+Randomized_Quicksort_Three_Way(arr4, 0, len(arr4) - 1)
+print('Sorted Array:', arr4, '\n')
+
+# Test Case 5
+arr5 = [12, 11, 13, 5, 6, 7, 1, 3, 4, 9, 8, 10, 2, 15, 14]
+print('Array:', arr5)
+print('Smallest element:', select(arr5, 0))
+print('Median:', select(arr5, len(arr5) // 2))
+print('p50, p95, p99:', quantiles(list(range(1, 101)), [0.5, 0.95, 0.99]), '\n')
+
+# Test Case 6
+percentiles = [0.07, 0.14, 0.17, 0.28, 0.34, 0.55, 0.56, 0.68, 0.81]
+print('Percentiles:', percentiles)
+for n in [100, 1000, 10000]:
+    expected = [round(q * n) for q in percentiles] # q * n is a whole number here
+    print(f'n = {n}, nearest ranks correct:', quantiles(range(1, n + 1), percentiles) == expected)
+print()
+
+# Benchmark for arrays with few distinct keys; other labs load this file, so it only runs
+# when the file is executed directly
+if __name__ == '__main__':
+    Benchmark_Low_Cardinality(2000, [2, 10, 100, 2000])
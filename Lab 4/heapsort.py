@@ -2,29 +2,32 @@
 
 # Function that maintains the max-heap property. 
 def Max_Heapify(A, i, heap_size):
-    left = 2 * i # left child
-    right = 2 * i + 1 # right child
-    # Check if left child is greater than the parent
-    if left < heap_size and A[left] > A[i]:
-        largest = left
-    else:
-        largest = i # Parent is greater than the left child
-    # Check if right child is greater than the parent
-    if right < heap_size and A[right] > A[largest]:
-        largest = right
-    # Check if the largest element is not the parent
-    if largest != i:
+    # Sift the element down iteratively until it is larger than both children
+    while True:
+        left = 2 * i + 1 # left child
+        right = 2 * i + 2 # right child
+        # Check if left child is greater than the parent
+        if left < heap_size and A[left] > A[i]:
+            largest = left
+        else:
+            largest = i # Parent is greater than the left child
+        # Check if right child is greater than the parent
+        if right < heap_size and A[right] > A[largest]:
+            largest = right
+        # Check if the parent is already the largest element
+        if largest == i:
+            return
         #Swap A[i] with A[largest]
         temp = A[i]
         A[i] = A[largest]
         A[largest] = temp
-        Max_Heapify(A, largest, heap_size) # Recursively maintain the max-heap property
+        i = largest # Continue to maintain the max-heap property one level down
 
 # Function that converts an array into a max-heap in a bottom up manner. 
 def Build_Max_Heap(A):
     heap_size = len(A)
     # Iterate through the array from the last non-leaf node to the root node
-    for i in range(heap_size // 2, -1, -1):
+    for i in range(heap_size // 2 - 1, -1, -1):
         Max_Heapify(A, i, heap_size)
 
 # Function that sorts the array using heapsort algorithm.
@@ -43,6 +46,189 @@ def Heapsort(A):
         # Restore the max-heap property
         Max_Heapify(A, 0, heap_size)
 
+# Priority queue class backed by an indexed d-ary heap.
+# Every item can be in the queue at most once; the index map records the
+# position of each item in the heap so that its priority can be changed or the
+# item removed in O(log n) instead of pushing duplicate entries.
+class PriorityQueue:
+    def __init__(self, order="min", d=2):
+        # Check that the heap order and fan-out are valid
+        if order not in ("min", "max"):
+            raise ValueError("order must be 'min' or 'max'")
+        if d < 2:
+            raise ValueError("d must be at least 2")
+        self.max_order = order == "max"
+        self.d = d # Number of children per node (4 is usually faster than 2)
+        self.heap = [] # List of [priority, item] entries
+        self.index = {} # Position of every item in the heap
+
+    # Method that returns the number of items in the queue
+    def __len__(self):
+        return len(self.heap)
+
+    # Method that checks whether an item is in the queue
+    def __contains__(self, item):
+        return item in self.index
+
+    # Method that checks whether priority a belongs above priority b in the heap
+    def higher(self, a, b):
+        return a > b if self.max_order else a < b
+
+    # Method to add a new item with the given priority
+    def push(self, item, priority):
+        if item in self.index:
+            raise ValueError("item is already in the queue")
+        self.heap.append([priority, item])
+        self.index[item] = len(self.heap) - 1
+        self.sift_up(len(self.heap) - 1)
+
+    # Method that returns the item with the highest priority and its priority
+    def peek(self):
+        if not self.heap:
+            raise IndexError("peek from an empty priority queue")
+        priority, item = self.heap[0]
+        return item, priority
+
+    # Method that removes and returns the item with the highest priority and its priority
+    def pop(self):
+        if not self.heap:
+            raise IndexError("pop from an empty priority queue")
+        priority, item = self.heap[0]
+        self.remove_at(0)
+        return item, priority
+
+    # Method that replaces the item with the highest priority by a new item
+    # with a single sift-down, and returns the replaced item and its priority
+    def replace_top(self, item, priority):
+        if not self.heap:
+            raise IndexError("replace_top on an empty priority queue")
+        if item in self.index:
+            raise ValueError("item is already in the queue")
+        old_priority, old_item = self.heap[0]
+        del self.index[old_item]
+        self.heap[0] = [priority, item]
+        self.index[item] = 0
+        self.sift_down(0)
+        return old_item, old_priority
+
+    # Method that returns the priority of an item in the queue
+    def priority(self, item):
+        return self.heap[self.index[item]][0]
+
+    # Method that changes the priority of an item in the queue
+    def update(self, item, priority):
+        i = self.index[item]
+        old_priority = self.heap[i][0]
+        self.heap[i][0] = priority
+        # Move the item towards the root or the leaves depending on the change
+        if self.higher(priority, old_priority):
+            self.sift_up(i)
+        else:
+            self.sift_down(i)
+
+    # Method that lowers the priority of an item in the queue
+    def decrease_key(self, item, priority):
+        if priority > self.priority(item):
+            raise ValueError("new priority is greater than the current priority")
+        self.update(item, priority)
+
+    # Method that raises the priority of an item in the queue
+    def increase_key(self, item, priority):
+        if priority < self.priority(item):
+            raise ValueError("new priority is smaller than the current priority")
+        self.update(item, priority)
+
+    # Method that removes an item from the queue and returns its priority
+    def remove(self, item):
+        i = self.index[item]
+        priority = self.heap[i][0]
+        self.remove_at(i)
+        return priority
+
+    # Method that removes the entry at position i of the heap
+    def remove_at(self, i):
+        heap = self.heap
+        del self.index[heap[i][1]]
+        last = heap.pop()
+        # Check if the removed entry was not the last one
+        if i < len(heap):
+            # Move the last entry into the hole and restore the heap property
+            heap[i] = last
+            self.index[last[1]] = i
+            if i > 0 and self.higher(last[0], heap[(i - 1) // self.d][0]):
+                self.sift_up(i)
+            else:
+                self.sift_down(i)
+
+    # Method that moves the entry at position i towards the root until its parent is higher
+    def sift_up(self, i):
+        heap = self.heap
+        entry = heap[i]
+        # Shift lower parents down into the hole instead of swapping at every level
+        while i > 0:
+            parent = (i - 1) // self.d
+            if not self.higher(entry[0], heap[parent][0]):
+                break
+            heap[i] = heap[parent]
+            self.index[heap[i][1]] = i
+            i = parent
+        heap[i] = entry
+        self.index[entry[1]] = i
+
+    # Method that moves the entry at position i towards the leaves until no child is higher
+    def sift_down(self, i):
+        heap = self.heap
+        size = len(heap)
+        entry = heap[i]
+        while True:
+            # Find the highest of the (up to d) children
+            first = self.d * i + 1
+            if first >= size:
+                break
+            best = first
+            for child in range(first + 1, min(first + self.d, size)):
+                if self.higher(heap[child][0], heap[best][0]):
+                    best = child
+            # Check if the entry is already higher than all of its children
+            if not self.higher(heap[best][0], entry[0]):
+                break
+            # Shift the highest child up into the hole
+            heap[i] = heap[best]
+            self.index[heap[i][1]] = i
+            i = best
+        heap[i] = entry
+        self.index[entry[1]] = i
+
+# Function that returns the k largest (or smallest) items of any iterable in one pass.
+# Only a bounded heap of k items is kept, so memory stays O(k) however long the
+# stream is. The root of the heap is the weakest of the items kept so far and is
+# replaced whenever a better item arrives. The result is ordered from best to
+# worst, and among equal keys the earliest items win.
+def top_k(iterable, k, key=None, largest=True):
+    if k <= 0:
+        return []
+    # A min-heap keeps the k largest items and a max-heap the k smallest ones
+    Q = PriorityQueue(order="min" if largest else "max", d=4)
+    items = {} # Item for each sequence number in the heap
+    seq = 0 # Arrival order of each item, used as its unique id in the heap
+    for item in iterable:
+        item_key = item if key is None else key(item)
+        # Later arrivals rank below earlier ones with the same key
+        priority = (item_key, -seq) if largest else (item_key, seq)
+        if len(Q) < k:
+            # The heap is not full yet
+            Q.push(seq, priority)
+            items[seq] = item
+        elif Q.higher(Q.heap[0][0], priority):
+            # The new item beats the weakest item kept so far
+            old_seq, _ = Q.replace_top(seq, priority)
+            del items[old_seq]
+            items[seq] = item
+        seq = seq + 1
+    # Order the kept items from best to worst
+    entries = sorted(Q.heap, reverse=largest)
+    return [items[s] for _, s in entries]
+
 # Test Case 1
 A = [4, 1, 3, 2, 16, 9, 10, 14, 8, 7]
 print("Original Array: ", A)
@@ -53,4 +239,17 @@ print("Sorted Array: ", A, "\n")
 B = [4, 1, 12, 3, 2, 5, 9, 10, 11, 6, 7, 8, 15, 14, 13] 
 print("Original Array: ", B)
 Heapsort(B)
-print("Sorted Array: ", B)
\ No newline at end of file
+print("Sorted Array: ", B, "\n")
+
+# Test Case 3
+Q = PriorityQueue(order="min", d=4)
+for task, priority in [("write", 5), ("test", 3), ("deploy", 8), ("review", 4), ("plan", 1)]:
+    Q.push(task, priority)
+Q.decrease_key("deploy", 2) # deploy becomes more urgent
+Q.remove("test") # test is no longer needed
+print("Tasks in priority order: ", [Q.pop() for _ in range(len(Q))], "\n")
+
+# Test Case 4
+requests = (("GET /page" + str(i), (i * 37) % 101) for i in range(10000)) # stream of (request, latency)
+print("3 slowest requests: ", top_k(requests, 3, key=lambda request: request[1]))
+print("4 smallest numbers: ", top_k(iter([9, 4, 7, 1, 8, 2, 6]), 4, largest=False))
\ No newline at end of file
@@ -0,0 +1,220 @@
+# Implementation for counting sort and radix sort algorithms (non-comparison sorts)
+
+import os
+import random
+import sys
+import time
+
+# NumPy is optional; without it the integer radix sort runs in pure Python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Number of key bits handled by each pass of the LSD radix sort
+DIGIT_BITS = 8
+# Buckets with at most this many elements are finished with insertion sort in MSD radix sort
+MSD_CUTOFF = 32
+
+# Function that sorts an array of integers (or items with integer keys) using counting sort.
+# It runs in O(n + k) time for a key range of size k, so it is meant for small key ranges.
+# The sort is stable.
+def Counting_Sort(A, key=None):
+    n = len(A)
+    if n < 2:
+        return
+    keys = A if key is None else [key(x) for x in A]
+    low = min(keys)
+    k = max(keys) - low + 1 # Size of the key range
+    # Count the occurrences of every key
+    C = [0] * k
+    for x in keys:
+        C[x - low] += 1
+    # C[i] now contains the number of keys less than i + low
+    total = 0
+    for i in range(k):
+        count = C[i]
+        C[i] = total
+        total += count
+    # Place every item at its final position, keeping equal keys in their original order
+    B = [None] * n
+    for j in range(n):
+        i = keys[j] - low
+        B[C[i]] = A[j]
+        C[i] += 1
+    A[:] = B
+
+# Function that sorts an array of integers (or items with integer keys) using LSD radix sort.
+# Negative keys are handled by offsetting every key by the minimum key. Each pass
+# distributes the items into 2^DIGIT_BITS buckets by one digit, starting with the
+# least significant one; the passes are stable, so the whole sort is stable.
+# When NumPy is available and the offset keys fit in 64 bits, every pass is vectorized.
+def LSD_Radix_Sort(A, key=None, use_numpy=None):
+    n = len(A)
+    if n < 2:
+        return
+    keys = A if key is None else [key(x) for x in A]
+    low = min(keys)
+    span = max(keys) - low # Largest offset key
+    if use_numpy is None:
+        use_numpy = np is not None
+    # Check if the keys can be handled by the vectorized passes
+    if use_numpy and np is not None and span < 2**64:
+        LSD_Radix_Sort_NumPy(A, keys, low, span)
+        return
+
+    # Number of digit passes needed for the largest offset key
+    passes = max((span.bit_length() + DIGIT_BITS - 1) // DIGIT_BITS, 1)
+    mask = (1 << DIGIT_BITS) - 1
+    # Pair every offset key with its item
+    pairs = [(k - low, x) for k, x in zip(keys, A)]
+    for d in range(passes):
+        shift = d * DIGIT_BITS
+        buckets = [[] for _ in range(mask + 1)]
+        # Distribute the items into the buckets of the current digit
+        for pair in pairs:
+            buckets[(pair[0] >> shift) & mask].append(pair)
+        # Collect the buckets in order
+        pairs = [pair for bucket in buckets for pair in bucket]
+    A[:] = [x for _, x in pairs]
+
+# Function that performs the LSD radix sort passes with NumPy.
+# Every pass stably orders the current permutation by one 16-bit digit.
+def LSD_Radix_Sort_NumPy(A, keys, low, span):
+    # Offset the keys in Python so that the whole unsigned 64-bit range fits
+    offset_keys = np.array([k - low for k in keys], dtype=np.uint64)
+    order = np.arange(len(A))
+    shift = 0
+    # Loop until every significant bit of the largest key has been handled
+    while shift == 0 or span >> shift:
+        digits = ((offset_keys[order] >> np.uint64(shift)) & np.uint64(0xFFFF)).astype(np.uint16)
+        # A stable argsort of 16-bit digits is itself a radix sort inside NumPy
+        order = order[np.argsort(digits, kind="stable")]
+        shift += 16
+    A[:] = [A[i] for i in order.tolist()]
+
+# Function that returns the byte string used as the MSD radix sort key.
+def byte_key(k):
+    if isinstance(k, str):
+        return k.encode("utf-8") # UTF-8 preserves the code point order
+    return bytes(k)
+
+# Function that sorts an array of byte strings (or items with byte string keys)
+# using MSD radix sort. Items are distributed by their first byte, then each bucket
+# by the next byte, and so on; keys that end at the current byte come before all
+# longer keys with the same prefix. Small buckets are finished with insertion sort.
+# An explicit stack is used instead of recursion, and the sort is stable.
+def MSD_Radix_Sort(A, key=None):
+    n = len(A)
+    if n < 2:
+        return
+    keys = [byte_key(x) for x in A] if key is None else [byte_key(key(x)) for x in A]
+    output = []
+    # Stack of (bucket, depth) pairs still to be sorted, with the next bucket on top
+    stack = [(list(zip(keys, A)), 0)]
+    while stack:
+        bucket, depth = stack.pop()
+        # Check if the bucket is small enough for insertion sort
+        if len(bucket) <= MSD_CUTOFF:
+            Insertion_Sort_Suffix(bucket, depth)
+            output.extend(x for _, x in bucket)
+            continue
+        # Bucket 0 holds the keys that end here, bucket b + 1 the keys with byte b at depth
+        buckets = [[] for _ in range(257)]
+        for pair in bucket:
+            k = pair[0]
+            buckets[k[depth] + 1 if depth < len(k) else 0].append(pair)
+        # Keys that end at this depth are all equal and already in order
+        output.extend(x for _, x in buckets[0])
+        # Push the other buckets in reverse so that the smallest byte is sorted first
+        for b in range(256, 0, -1):
+            if buckets[b]:
+                stack.append((buckets[b], depth + 1))
+    A[:] = output
+
+# Function that sorts (key, item) pairs sharing their first depth bytes using insertion sort.
+def Insertion_Sort_Suffix(pairs, depth):
+    for i in range(1, len(pairs)):
+        pair = pairs[i]
+        suffix = pair[0][depth:]
+        j = i - 1
+        # Shift the pairs with a greater suffix to the right by one position
+        while j >= 0 and pairs[j][0][depth:] > suffix:
+            pairs[j + 1] = pairs[j]
+            j = j - 1
+        pairs[j + 1] = pair
+
+# Function that compares the throughput of the non-comparison sorts with the comparison
+# sorts of the other labs on the same random 32-bit integer keys.
+def Benchmark_Sorts(n, seed=0, insertion_sort_limit=5000):
+    # The other lab folders are loaded with the loader of the benchmark suite
+    benchmarks = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Benchmarks")
+    if benchmarks not in sys.path:
+        sys.path.append(benchmarks)
+    from sortBenchmark import load_lab_module
+
+    insertion = load_lab_module(os.path.join("Lab 1", "insertionSort.py"))
+    merge = load_lab_module(os.path.join("Lab 1", "mergeSort.py"))
+    quick = load_lab_module(os.path.join("Lab 3", "randomQuicksort.py"))
+    heap = load_lab_module(os.path.join("Lab 4", "heapsort.py"))
+
+    rng = random.Random(seed)
+    data = [rng.randint(-2**31, 2**31 - 1) for _ in range(n)]
+    small_range = [rng.randrange(1000) for _ in range(n)]
+    strings = [rng.getrandbits(64).to_bytes(8, "big") for _ in range(n)]
+
+    # (name, sort function, input) for every sort to be measured
+    sorts = [
+        ("insertion_sort", insertion.insertion_sort, data),
+        ("merge_sort", lambda A: merge.merge_sort(A, len(A)), data),
+        ("bottom_up_merge_sort", merge.bottom_up_merge_sort, data),
+        ("Randomized_Quicksort", lambda A: quick.Randomized_Quicksort(A, 0, len(A) - 1), data),
+        ("Heapsort", heap.Heapsort, data),
+        ("Counting_Sort (keys < 1000)", Counting_Sort, small_range),
+        ("LSD_Radix_Sort", lambda A: LSD_Radix_Sort(A, use_numpy=False), data),
+        ("MSD_Radix_Sort (8-byte keys)", MSD_Radix_Sort, strings),
+    ]
+    if np is not None:
+        sorts.append(("LSD_Radix_Sort (NumPy)", lambda A: LSD_Radix_Sort(A, use_numpy=True), data))
+
+    print(f"n = {n}")
+    for name, sort, source in sorts:
+        # Insertion sort is quadratic and is skipped on large inputs
+        if sort is insertion.insertion_sort and n > insertion_sort_limit:
+            print(f"{name:>30}: skipped")
+            continue
+        arr = list(source)
+        start = time.perf_counter()
+        sort(arr)
+        elapsed = time.perf_counter() - start
+        assert arr == sorted(source)
+        print(f"{name:>30}: {elapsed:.4f} s ({n / elapsed / 1e6:.2f} M items/s)")
+
+# Test Case 1
+A = [4, 1, 3, 2, 16, 9, 10, 14, 8, 7, 3, 1]
+print("Original Array: ", A)
+Counting_Sort(A)
+print("Counting Sort: ", A, "\n")
+
+# Test Case 2
+B = [170, -45, 75, -90, 802, 24, 2, 66, -1, 0]
+print("Original Array: ", B)
+LSD_Radix_Sort(B)
+print("LSD Radix Sort: ", B, "\n")
+
+# Test Case 3
+C = [b"banana", b"apple", b"band", b"ban", b"apricot", b"bandana", b"a"]
+print("Original Array: ", C)
+MSD_Radix_Sort(C)
+print("MSD Radix Sort: ", C, "\n")
+
+# Test Case 4
+D = [("carol", 31), ("alice", 25), ("bob", 31), ("dave", 25)]
+LSD_Radix_Sort(D, key=lambda person: person[1])
+print("Sorted by age (stable): ", D, "\n")
+
+# The benchmark loads and runs the other sort labs, so it only runs when this file is
+# executed directly and not when another file loads it.
+if __name__ == "__main__":
+    # Benchmark against the comparison sorts
+    Benchmark_Sorts(20000)
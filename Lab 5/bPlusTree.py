@@ -0,0 +1,351 @@
+# Implementation for a disk-backed B+-tree with fixed-size pages and an LRU page cache
+
+import bisect
+import os
+import struct
+import tempfile
+from collections import OrderedDict
+
+# Layout of page 0 of the file: magic, page size, root page, height, number of keys, number of pages
+FILE_HEADER = struct.Struct(">8sIqqqq")
+MAGIC = b"BPTREE01"
+# Layout of the start of every node page: leaf flag, number of keys, next leaf page (0 if none)
+PAGE_HEADER = struct.Struct(">BxHq")
+
+# Page class that represents one node of the tree decoded in memory.
+# A leaf holds sorted keys with one value each and the number of the next leaf page, so
+# the leaves form a linked list in key order. An internal node holds sorted keys and
+# len(keys) + 1 child page numbers (in values); child i holds the keys k with
+# keys[i - 1] <= k < keys[i].
+class Page:
+    __slots__ = ("number", "is_leaf", "keys", "values", "next", "dirty")
+
+    def __init__(self, number, is_leaf, keys=None, values=None, next=0):
+        self.number = number
+        self.is_leaf = is_leaf
+        self.keys = [] if keys is None else keys
+        self.values = [] if values is None else values
+        self.next = next
+        self.dirty = False # True when the page must be written back to the file
+
+# Page cache class that keeps up to capacity decoded pages in least recently used order.
+# Pages are read from the file on a miss; a changed page is written back when it is
+# evicted or when the cache is flushed.
+class PageCache:
+    def __init__(self, file, page_size, capacity):
+        if capacity < 1:
+            raise ValueError("the cache must hold at least one page")
+        self.file = file
+        self.page_size = page_size
+        self.capacity = capacity
+        self.pages = OrderedDict() # page number -> Page, least recently used first
+        self.reads = 0 # Number of pages read from the file
+        self.writes = 0 # Number of pages written to the file
+
+    # Method that returns page number, reading it from the file if it is not cached
+    def get(self, number):
+        page = self.pages.get(number)
+        if page is not None:
+            self.pages.move_to_end(number) # now the most recently used page
+            return page
+        self.file.seek(number * self.page_size)
+        data = self.file.read(self.page_size)
+        self.reads += 1
+        page = decode_page(number, data)
+        self.pages[number] = page
+        self.evict()
+        return page
+
+    # Method that marks a page as changed and keeps it in the cache
+    # (a page that was evicted while the caller held it is put back)
+    def put(self, page):
+        page.dirty = True
+        self.pages[page.number] = page
+        self.pages.move_to_end(page.number)
+        self.evict()
+
+    # Method that evicts the least recently used pages until the cache fits its capacity
+    def evict(self):
+        while len(self.pages) > self.capacity:
+            _, page = self.pages.popitem(last=False)
+            if page.dirty:
+                self.write(page)
+
+    # Method that writes a page to its slot in the file
+    def write(self, page):
+        self.file.seek(page.number * self.page_size)
+        self.file.write(encode_page(page, self.page_size))
+        self.writes += 1
+        page.dirty = False
+
+    # Method that writes every changed page back to the file
+    def flush(self):
+        for page in self.pages.values():
+            if page.dirty:
+                self.write(page)
+
+# Function that returns the bytes of a page padded to page_size.
+def encode_page(page, page_size):
+    n = len(page.keys)
+    data = PAGE_HEADER.pack(1 if page.is_leaf else 0, n, page.next)
+    data += struct.pack(f">{n}q{len(page.values)}q", *page.keys, *page.values)
+    return data + bytes(page_size - len(data))
+
+# Function that decodes the bytes of a page.
+def decode_page(number, data):
+    is_leaf, n, next = PAGE_HEADER.unpack_from(data)
+    # A leaf stores one value per key, an internal node one more child than keys
+    m = n if is_leaf else n + 1
+    fields = struct.unpack_from(f">{n}q{m}q", data, PAGE_HEADER.size)
+    return Page(number, bool(is_leaf), list(fields[:n]), list(fields[n:]), next)
+
+# B+-tree class that stores 64-bit integer keys and values in a single file of fixed-size pages.
+# Page 0 holds the file header and every other page holds one node. With 4 KB pages a node
+# holds 255 keys, so a point lookup reads about log_256(n) pages, a range scan reads the
+# leaves one after another through their next links, and every key costs 16 bytes on disk.
+class BPlusTree:
+    def __init__(self, path, page_size=4096, cache_pages=256):
+        # Page capacities: the header, then 8 bytes per key and 8 per value or child
+        self.leaf_capacity = (page_size - PAGE_HEADER.size) // 16
+        self.internal_capacity = (page_size - PAGE_HEADER.size - 8) // 16
+        if self.internal_capacity < 3 or page_size < FILE_HEADER.size:
+            raise ValueError("page size is too small")
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "r+b" if exists else "w+b")
+        if exists:
+            magic, stored_size, self.root, self.height, self.count, self.page_count = \
+                FILE_HEADER.unpack(self.file.read(FILE_HEADER.size))
+            if magic != MAGIC:
+                self.file.close()
+                raise ValueError("not a B+-tree file")
+            if stored_size != page_size:
+                self.file.close()
+                raise ValueError(f"the file uses pages of {stored_size} bytes")
+        self.page_size = page_size
+        self.cache = PageCache(self.file, page_size, cache_pages)
+        if not exists:
+            # A new tree is a single empty leaf
+            self.page_count = 1
+            root = self.new_page(True)
+            self.cache.put(root)
+            self.root = root.number
+            self.height = 1 # Number of levels, counting the leaves
+            self.count = 0 # Number of keys
+            self.flush()
+
+    # Method that returns the number of keys in the tree
+    def __len__(self):
+        return self.count
+
+    # Method that allocates a new page at the end of the file
+    # (the caller puts it in the cache once it holds its keys)
+    def new_page(self, is_leaf):
+        page = Page(self.page_count, is_leaf)
+        self.page_count += 1
+        return page
+
+    # Method that returns the leaf that would hold key, and the path of (page, child index) above it
+    def find_leaf(self, key):
+        path = []
+        page = self.cache.get(self.root)
+        while not page.is_leaf:
+            i = bisect.bisect_right(page.keys, key)
+            path.append((page, i))
+            page = self.cache.get(page.values[i])
+        return page, path
+
+    # Method that returns the value stored with key, or None if the key is not in the tree
+    def search(self, key):
+        leaf, _ = self.find_leaf(key)
+        i = bisect.bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            return leaf.values[i]
+        return None
+
+    # Method that checks whether key is in the tree
+    def __contains__(self, key):
+        return self.search(key) is not None
+
+    # Method that inserts key with value, replacing the value if the key is already there
+    def insert(self, key, value):
+        leaf, path = self.find_leaf(key)
+        i = bisect.bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            leaf.values[i] = value
+            self.cache.put(leaf)
+            return
+        leaf.keys.insert(i, key)
+        leaf.values.insert(i, value)
+        self.count += 1
+        if len(leaf.keys) <= self.leaf_capacity:
+            self.cache.put(leaf)
+            return
+        # An overfull page does not fit in a page of the file, so it is split before it is put back
+        # Split the full leaf in two; the first key of the right half goes up as a separator
+        right = self.new_page(True)
+        mid = len(leaf.keys) // 2
+        right.keys, leaf.keys = leaf.keys[mid:], leaf.keys[:mid]
+        right.values, leaf.values = leaf.values[mid:], leaf.values[:mid]
+        right.next, leaf.next = leaf.next, right.number
+        separator = right.keys[0]
+        self.cache.put(leaf)
+        self.cache.put(right)
+        # Insert the separator into the parents, splitting them while they overflow
+        while path:
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.values.insert(i + 1, right.number)
+            if len(parent.keys) <= self.internal_capacity:
+                self.cache.put(parent)
+                return
+            # The middle key moves up and is not kept in either half
+            right = self.new_page(False)
+            mid = len(parent.keys) // 2
+            separator = parent.keys[mid]
+            right.keys, parent.keys = parent.keys[mid + 1:], parent.keys[:mid]
+            right.values, parent.values = parent.values[mid + 1:], parent.values[:mid + 1]
+            self.cache.put(parent)
+            self.cache.put(right)
+            leaf = parent
+        # The root was split, so the tree grows by one level
+        root = self.new_page(False)
+        root.keys = [separator]
+        root.values = [leaf.number, right.number]
+        self.cache.put(root)
+        self.root = root.number
+        self.height += 1
+
+    # Method that builds the tree from (key, value) pairs sorted by strictly increasing key.
+    # The leaves are filled to fill times their capacity and written one after another, then
+    # every level of internal nodes is built over the level below, so loading takes O(n)
+    # and the leaves end up stored in key order in the file.
+    def bulk_load(self, items, fill=1.0):
+        if self.count != 0:
+            raise ValueError("bulk loading needs an empty tree")
+        per_leaf = max(1, int(self.leaf_capacity * fill))
+        # Reuse the pages of the empty tree
+        self.cache.pages.clear()
+        self.page_count = 1
+        level = [] # (first key, page number) of every node of the level being built
+        leaf = None
+        previous_key = None
+        for key, value in items:
+            if previous_key is not None and key <= previous_key:
+                raise ValueError("keys are not sorted in strictly increasing order")
+            previous_key = key
+            if leaf is None or len(leaf.keys) == per_leaf:
+                new_leaf = self.new_page(True)
+                if leaf is not None:
+                    leaf.next = new_leaf.number
+                    self.cache.put(leaf)
+                leaf = new_leaf
+                level.append((key, leaf.number))
+            leaf.keys.append(key)
+            leaf.values.append(value)
+            self.count += 1
+        if leaf is None:
+            # No items: the tree is a single empty leaf again
+            leaf = self.new_page(True)
+            level.append((None, leaf.number))
+        self.cache.put(leaf)
+        self.height = 1
+        # Build the internal levels, spreading the children evenly over the nodes
+        while len(level) > 1:
+            fan_out = self.internal_capacity + 1
+            nodes = (len(level) + fan_out - 1) // fan_out
+            next_level = []
+            start = 0
+            for j in range(nodes):
+                end = start + (len(level) - start) // (nodes - j)
+                node = self.new_page(False)
+                node.keys = [first for first, _ in level[start + 1:end]]
+                node.values = [number for _, number in level[start:end]]
+                self.cache.put(node)
+                next_level.append((level[start][0], node.number))
+                start = end
+            level = next_level
+            self.height += 1
+        self.root = level[0][1]
+
+    # Method that returns the (key, value) pair with the smallest key, or None if the tree is empty
+    def minimum(self):
+        page = self.cache.get(self.root)
+        while not page.is_leaf:
+            page = self.cache.get(page.values[0]) # leftmost child
+        # Leaves are never left empty except in an empty tree
+        return (page.keys[0], page.values[0]) if page.keys else None
+
+    # Method that returns the (key, value) pair with the largest key, or None if the tree is empty
+    def maximum(self):
+        page = self.cache.get(self.root)
+        while not page.is_leaf:
+            page = self.cache.get(page.values[-1]) # rightmost child
+        return (page.keys[-1], page.values[-1]) if page.keys else None
+
+    # Method that returns the (key, value) pair with the smallest key greater than key, or None
+    def successor(self, key):
+        leaf, _ = self.find_leaf(key)
+        i = bisect.bisect_right(leaf.keys, key)
+        # The successor is in the next leaf when key is at the end of its leaf
+        while i == len(leaf.keys):
+            if leaf.next == 0:
+                return None
+            leaf = self.cache.get(leaf.next)
+            i = 0
+        return leaf.keys[i], leaf.values[i]
+
+    # Method that lazily yields the (key, value) pairs with lo <= key < hi in sorted order.
+    # After one descent the scan follows the next links, so the leaves are read in order.
+    def range(self, lo, hi):
+        leaf, _ = self.find_leaf(lo)
+        i = bisect.bisect_left(leaf.keys, lo)
+        while True:
+            while i < len(leaf.keys):
+                if not leaf.keys[i] < hi:
+                    return
+                yield leaf.keys[i], leaf.values[i]
+                i = i + 1
+            if leaf.next == 0:
+                return
+            leaf = self.cache.get(leaf.next)
+            i = 0
+
+    # Method that writes the changed pages and the file header to the file
+    def flush(self):
+        self.cache.flush()
+        self.file.seek(0)
+        self.file.write(FILE_HEADER.pack(MAGIC, self.page_size, self.root, self.height,
+                                         self.count, self.page_count))
+        self.file.flush()
+
+    # Method that flushes and closes the file
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Test case 1
+with tempfile.TemporaryDirectory() as work_dir:
+    path = os.path.join(work_dir, "index.bpt")
+    n = 200000
+    with BPlusTree(path, cache_pages=64) as tree:
+        tree.bulk_load((key, key * 10) for key in range(0, 2 * n, 2)) # even keys
+        for key in range(1, 2000, 2): # odd keys inserted one by one
+            tree.insert(key, key * 10)
+        print(f"Keys: {len(tree)}, height: {tree.height}, pages in file: {tree.page_count}")
+        print("Search 4242:", tree.search(4242), " search 4243:", tree.search(4243))
+        print("Minimum:", tree.minimum(), " maximum:", tree.maximum())
+        print("Successor of 1999:", tree.successor(1999), " of 399998:", tree.successor(399998))
+        print("Keys in [1995, 2006):", [key for key, _ in tree.range(1995, 2006)])
+
+    # Reopen the file with a cold cache and count the page reads per lookup
+    with BPlusTree(path, cache_pages=64) as tree:
+        tree.cache.reads = 0
+        found = sum(tree.search(key) is not None for key in range(0, 2 * n, 997))
+        print(f"After reopening: {found} keys found, {tree.cache.reads / len(range(0, 2 * n, 997)):.2f} page reads per lookup")
@@ -1,17 +1,32 @@
 # Implementation for binary search tree (BST) data structure
 
+# Colors of the nodes in a red-black tree
+RED = "RED"
+BLACK = "BLACK"
+
 # Binary Search Tree class that represents an empty BST.
 class BinarySearchTree:
     def __init__(self):
         self.root = None
 
+# Red-black tree class that represents an empty red-black tree.
+# Its nodes must be added with RB_Insert and removed with RB_Delete, which keep the
+# height below 2 * log2(n + 1); every other BST function works on it unchanged.
+class RedBlackTree(BinarySearchTree):
+    pass
+
 # Node class that represents a node in a BST.
+# __slots__ stores the fields in a fixed layout instead of a per-node dictionary.
 class Node:
+    __slots__ = ("key", "left", "right", "p", "color", "size")
+
     def __init__(self, key):
         self.key = key
         self.left = None
         self.right = None
         self.p = None
+        self.color = RED # New nodes of a red-black tree start red
+        self.size = 1 # Number of nodes in the subtree rooted at this node
 
 # Function that inserts a new node into the BST by tracing down from the root.
 def Tree_Insert(T, z):
@@ -19,6 +34,7 @@ def Tree_Insert(T, z):
     y = None # y will be a parent of x
     while x != None: # descend until reaching a leaf
         y = x
+        y.size = y.size + 1 # z will be added to the subtree of every node on the path
         if z.key < x.key:
             x = x.left
         else:
@@ -31,21 +47,32 @@ def Tree_Insert(T, z):
     else:
         y.right = z
 
-# Function that recursively prints out all the elements of a BST in sorted order.
+# Function that prints out all the elements of a BST in sorted order.
+# It steps from each node to its successor instead of recursing, so deep trees cannot
+# exceed the recursion limit; every edge is followed at most twice, so it takes O(n).
 def Inorder_Tree_Walk(x):
     if x != None:
-        Inorder_Tree_Walk(x.left)
-        print(x.key)
-        Inorder_Tree_Walk(x.right)
+        y = x.p # Stop when the walk climbs out of the subtree rooted at x
+        x = Tree_Minimum(x)
+        while x != y:
+            print(x.key)
+            # Move to the successor within the subtree
+            if x.right != None:
+                x = Tree_Minimum(x.right)
+            else:
+                while x.p != y and x == x.p.right:
+                    x = x.p
+                x = x.p
 
 # Function that searches for a key in a BST.
 def Tree_Search(x, k):
-    if x == None or k == x.key:
-        return x 
-    if k < x.key:
-        return Tree_Search(x.left, k)
-    else:
-        return Tree_Search(x.right, k)
+    # Descend iteratively until the key is found or a leaf is reached
+    while x != None and k != x.key:
+        if k < x.key:
+            x = x.left
+        else:
+            x = x.right
+    return x
     
 # Function that returns the minimum element in a BST.
 def Tree_Minimum(x):
@@ -73,7 +100,7 @@ def Tree_Successor(x):
 # Function that returns the predecessor of a node in a BST.
 def Tree_Predecessor(x):
     if x.left != None:
-        return Tree_Maximum(x.right) # rightmost node in left subtree
+        return Tree_Maximum(x.left) # rightmost node in left subtree
     else: # find the lowest ancestor of x whose right child is an ancestor of x
         y = x.p
         while y != None and x == y.left:
@@ -81,6 +108,333 @@ def Tree_Predecessor(x):
             y = y.p
         return y
     
+# Function that returns the size of the subtree rooted at x; missing leaves (None) have size 0.
+def Size(x):
+    return 0 if x == None else x.size
+
+# Function that returns the color of a node; the missing leaves (None) are black.
+def Color(x):
+    return BLACK if x == None else x.color
+
+# Function that rotates x down to the left, making its right child its parent.
+def Left_Rotate(T, x):
+    y = x.right
+    x.right = y.left # turn y's left subtree into x's right subtree
+    if y.left != None:
+        y.left.p = x
+    y.p = x.p # x's parent becomes y's parent
+    if x.p == None:
+        T.root = y
+    elif x == x.p.left:
+        x.p.left = y
+    else:
+        x.p.right = y
+    y.left = x # put x on y's left
+    x.p = y
+    y.size = x.size # y now roots the subtree x rooted before
+    x.size = Size(x.left) + Size(x.right) + 1
+
+# Function that rotates x down to the right, making its left child its parent.
+def Right_Rotate(T, x):
+    y = x.left
+    x.left = y.right # turn y's right subtree into x's left subtree
+    if y.right != None:
+        y.right.p = x
+    y.p = x.p # x's parent becomes y's parent
+    if x.p == None:
+        T.root = y
+    elif x == x.p.right:
+        x.p.right = y
+    else:
+        x.p.left = y
+    y.right = x # put x on y's right
+    x.p = y
+    y.size = x.size # y now roots the subtree x rooted before
+    x.size = Size(x.left) + Size(x.right) + 1
+
+# Function that inserts a new node into a red-black tree in O(log n).
+def RB_Insert(T, z):
+    z.left = None
+    z.right = None
+    z.color = RED
+    z.size = 1
+    Tree_Insert(T, z) # insert z like in an ordinary BST
+    RB_Insert_Fixup(T, z) # correct any violation of the red-black properties
+
+# Function that restores the red-black properties after inserting the red node z.
+def RB_Insert_Fixup(T, z):
+    while Color(z.p) == RED: # z and its parent are both red
+        if z.p == z.p.p.left: # is z's parent a left child?
+            y = z.p.p.right # y is z's uncle
+            if Color(y) == RED: # case 1: recolor and move up the tree
+                z.p.color = BLACK
+                y.color = BLACK
+                z.p.p.color = RED
+                z = z.p.p
+            else:
+                if z == z.p.right: # case 2: rotate z into the left position
+                    z = z.p
+                    Left_Rotate(T, z)
+                z.p.color = BLACK # case 3: recolor and rotate the grandparent
+                z.p.p.color = RED
+                Right_Rotate(T, z.p.p)
+        else: # same as above, but with "right" and "left" exchanged
+            y = z.p.p.left
+            if Color(y) == RED:
+                z.p.color = BLACK
+                y.color = BLACK
+                z.p.p.color = RED
+                z = z.p.p
+            else:
+                if z == z.p.left:
+                    z = z.p
+                    Right_Rotate(T, z)
+                z.p.color = BLACK
+                z.p.p.color = RED
+                Left_Rotate(T, z.p.p)
+    T.root.color = BLACK
+
+# Function that replaces the subtree rooted at u with the subtree rooted at v.
+def Transplant(T, u, v):
+    if u.p == None:
+        T.root = v
+    elif u == u.p.left:
+        u.p.left = v
+    else:
+        u.p.right = v
+    if v != None:
+        v.p = u.p
+
+# Function that deletes node z from a red-black tree in O(log n).
+def RB_Delete(T, z):
+    y = z # y is the node removed from the tree or moved within it
+    y_original_color = y.color
+    if z.left == None:
+        x = z.right # x moves into y's original position
+        x_parent = z.p # parent of x, kept because x may be a missing leaf
+        Transplant(T, z, z.right) # replace z by its right child
+    elif z.right == None:
+        x = z.left
+        x_parent = z.p
+        Transplant(T, z, z.left) # replace z by its left child
+    else:
+        y = Tree_Minimum(z.right) # y is z's successor
+        y_original_color = y.color
+        x = y.right
+        if y.p == z:
+            x_parent = y
+        else: # is y farther down the tree?
+            x_parent = y.p
+            Transplant(T, y, y.right) # replace y by its right child
+            y.right = z.right # z's right child becomes y's right child
+            y.right.p = y
+        Transplant(T, z, y) # replace z by its successor y
+        y.left = z.left # and give z's left child to y,
+        y.left.p = y # which had no left child
+        y.color = z.color
+    # Every subtree that lost a node is rooted on the path from x's parent to the root
+    w = x_parent
+    while w != None:
+        w.size = Size(w.left) + Size(w.right) + 1
+        w = w.p
+    # Removing or moving a black node can violate the red-black properties
+    if y_original_color == BLACK:
+        RB_Delete_Fixup(T, x, x_parent)
+    z.left = z.right = z.p = None
+    z.size = 1
+
+# Function that restores the red-black properties after a deletion; x carries an extra black.
+def RB_Delete_Fixup(T, x, x_parent):
+    while x != T.root and Color(x) == BLACK:
+        if x == x_parent.left: # is x a left child?
+            w = x_parent.right # w is x's sibling
+            if Color(w) == RED: # case 1: make the sibling black
+                w.color = BLACK
+                x_parent.color = RED
+                Left_Rotate(T, x_parent)
+                w = x_parent.right
+            if Color(w.left) == BLACK and Color(w.right) == BLACK: # case 2: move the extra black up
+                w.color = RED
+                x = x_parent
+                x_parent = x.p
+            else:
+                if Color(w.right) == BLACK: # case 3: make the sibling's right child red
+                    w.left.color = BLACK
+                    w.color = RED
+                    Right_Rotate(T, w)
+                    w = x_parent.right
+                w.color = x_parent.color # case 4: rotate the extra black away
+                x_parent.color = BLACK
+                w.right.color = BLACK
+                Left_Rotate(T, x_parent)
+                x = T.root
+        else: # same as above, but with "right" and "left" exchanged
+            w = x_parent.left
+            if Color(w) == RED:
+                w.color = BLACK
+                x_parent.color = RED
+                Right_Rotate(T, x_parent)
+                w = x_parent.left
+            if Color(w.right) == BLACK and Color(w.left) == BLACK:
+                w.color = RED
+                x = x_parent
+                x_parent = x.p
+            else:
+                if Color(w.left) == BLACK:
+                    w.right.color = BLACK
+                    w.color = RED
+                    Left_Rotate(T, w)
+                    w = x_parent.left
+                w.color = x_parent.color
+                x_parent.color = BLACK
+                w.left.color = BLACK
+                Right_Rotate(T, x_parent)
+                x = T.root
+    if x != None:
+        x.color = BLACK
+
+# Function that returns the node with the i-th smallest key in the subtree rooted at x (1-based).
+def OS_Select(x, i):
+    if i < 1 or i > Size(x):
+        raise IndexError("rank out of range")
+    while True:
+        r = Size(x.left) + 1 # rank of x within the subtree rooted at x
+        if i == r:
+            return x
+        elif i < r:
+            x = x.left
+        else:
+            x = x.right
+            i = i - r # the i-th smallest in x's subtree is the (i - r)-th in its right subtree
+
+# Function that returns the rank of node x in the sorted order of the keys of T (1-based).
+def OS_Rank(T, x):
+    r = Size(x.left) + 1 # rank of x within the subtree rooted at x
+    y = x
+    while y != T.root:
+        # A right child comes after its parent and its parent's left subtree
+        if y == y.p.right:
+            r = r + Size(y.p.left) + 1
+        y = y.p
+    return r
+
+# Function that returns the number of keys in T that are less than k.
+def OS_Key_Rank(T, k):
+    x = T.root
+    count = 0
+    while x != None:
+        if k <= x.key:
+            x = x.left
+        else:
+            count = count + Size(x.left) + 1 # x and its left subtree are all less than k
+            x = x.right
+    return count
+
+# Function that returns the number of keys in T in the range [lo, hi).
+def OS_Count_Range(T, lo, hi):
+    if hi <= lo:
+        return 0
+    return OS_Key_Rank(T, hi) - OS_Key_Rank(T, lo)
+
+# Function that returns the height of a BST (the number of nodes on its longest path).
+def Tree_Height(x):
+    height = 0
+    level = [x] if x != None else []
+    # Count the levels breadth-first, without recursion
+    while level:
+        height += 1
+        level = [c for y in level for c in (y.left, y.right) if c != None]
+    return height
+
+# Function that returns the node with the smallest key not less than k, or None.
+def Tree_Lower_Bound(T, k):
+    x = T.root
+    y = None # lowest node seen so far with key >= k
+    while x != None:
+        if k <= x.key:
+            y = x
+            x = x.left
+        else:
+            x = x.right
+    return y
+
+# Function that returns the node with the largest key less than k, or None.
+def Tree_Before(T, k):
+    x = T.root
+    y = None # highest node seen so far with key < k
+    while x != None:
+        if x.key < k:
+            y = x
+            x = x.right
+        else:
+            x = x.left
+    return y
+
+# Function that lazily yields the keys of a BST in sorted (or reverse sorted) order.
+# Each step moves to the successor (or predecessor), so the scan uses no recursion and
+# costs O(1) amortized per key; it can be stopped early at no extra cost.
+def Tree_Items(T, reverse=False):
+    if T.root == None:
+        return
+    if reverse:
+        x = Tree_Maximum(T.root)
+        while x != None:
+            yield x.key
+            x = Tree_Predecessor(x)
+    else:
+        x = Tree_Minimum(T.root)
+        while x != None:
+            yield x.key
+            x = Tree_Successor(x)
+
+# Function that lazily yields the keys k with lo <= k < hi in sorted (or reverse sorted) order.
+# Finding the first key takes O(h), then every key costs O(1) amortized.
+def Tree_Range(T, lo, hi, reverse=False):
+    if reverse:
+        x = Tree_Before(T, hi)
+        while x != None and x.key >= lo:
+            yield x.key
+            x = Tree_Predecessor(x)
+    else:
+        x = Tree_Lower_Bound(T, lo)
+        while x != None and x.key < hi:
+            yield x.key
+            x = Tree_Successor(x)
+
+# Function that builds a balanced red-black tree from sorted keys in O(n).
+# The middle key of every range becomes the root of that range, so all paths from the
+# root to a missing leaf have the same length, give or take one. Every complete level is
+# black and the nodes of an incomplete last level are red, which satisfies the red-black
+# properties, so the tree can be updated with RB_Insert and RB_Delete afterwards.
+def Tree_From_Sorted(keys):
+    keys = list(keys)
+    for i in range(1, len(keys)):
+        if keys[i] < keys[i - 1]:
+            raise ValueError("keys are not sorted")
+    T = RedBlackTree()
+    n = len(keys)
+    black_levels = (n + 1).bit_length() - 1 # number of complete levels
+    # Explicit stack of (first, end, parent, is_right_child, depth) ranges still to be built
+    stack = [(0, n, None, False, 0)]
+    while stack:
+        first, end, parent, is_right, depth = stack.pop()
+        if first >= end:
+            continue
+        mid = (first + end) // 2
+        z = Node(keys[mid])
+        z.size = end - first
+        z.color = BLACK if depth < black_levels else RED
+        z.p = parent
+        if parent == None:
+            T.root = z
+        elif is_right:
+            parent.right = z
+        else:
+            parent.left = z
+        stack.append((mid + 1, end, z, True, depth + 1))
+        stack.append((first, mid, z, False, depth + 1))
+    return T
+
 # Test case 1
 Tree1 = BinarySearchTree() # Start with an empty tree
 Tree_Insert(Tree1, Node(15))
@@ -118,4 +472,35 @@ Inorder_Tree_Walk(Tree2.root) # Tree traversal
 print("Tree Minimum: ", Tree_Minimum(Tree2.root).key)
 print("Tree Maximum: ", Tree_Maximum(Tree2.root).key)
 print("Tree Search: ", Tree_Search(Tree2.root, 40).key)
-print("Tree Predecessor: ", Tree_Predecessor(Tree_Search(Tree2.root, 40)).key)
\ No newline at end of file
+print("Tree Predecessor: ", Tree_Predecessor(Tree_Search(Tree2.root, 40)).key, "\n")
+
+# Test case 3
+Tree3 = RedBlackTree() # Start with an empty red-black tree
+for key in range(1, 1001): # keys arriving in sorted order
+    RB_Insert(Tree3, Node(key))
+print("Red-black tree height after 1000 sorted inserts: ", Tree_Height(Tree3.root))
+for key in range(1, 1001, 2):
+    RB_Delete(Tree3, Tree_Search(Tree3.root, key))
+print("Height after deleting the odd keys: ", Tree_Height(Tree3.root))
+print("Tree Minimum: ", Tree_Minimum(Tree3.root).key)
+print("Tree Maximum: ", Tree_Maximum(Tree3.root).key)
+print("Tree Successor: ", Tree_Successor(Tree_Search(Tree3.root, 500)).key)
+print("Tree Predecessor: ", Tree_Predecessor(Tree_Search(Tree3.root, 500)).key, "\n")
+
+# Test case 4
+Tree4 = RedBlackTree()
+for key in [41, 38, 31, 12, 19, 8, 26, 14, 30, 47, 16, 20, 35, 39, 28, 17, 21]:
+    RB_Insert(Tree4, Node(key))
+print("5th smallest key: ", OS_Select(Tree4.root, 5).key)
+print("Rank of key 26: ", OS_Rank(Tree4, Tree_Search(Tree4.root, 26)))
+print("Keys less than 30: ", OS_Key_Rank(Tree4, 30))
+print("Keys in [15, 30): ", OS_Count_Range(Tree4, 15, 30), "\n")
+
+# Test case 5
+Tree5 = Tree_From_Sorted(range(1, 16)) # 15 keys fill exactly 4 levels
+print("Height of a tree bulk-loaded with 15 keys: ", Tree_Height(Tree5.root))
+print("Keys in [4, 9): ", list(Tree_Range(Tree5, 4, 9)))
+print("Keys in [4, 9) in reverse: ", list(Tree_Range(Tree5, 4, 9, reverse=True)))
+print("Largest three keys: ", [key for key, _ in zip(Tree_Items(Tree5, reverse=True), range(3))])
+RB_Insert(Tree5, Node(16)) # the bulk-loaded tree is a valid red-black tree
+print("All keys after inserting 16: ", list(Tree_Items(Tree5)))
\ No newline at end of file
@@ -0,0 +1,225 @@
+# Implementation for a persistent (path-copying) balanced BST with lock-free snapshots
+
+import threading
+
+# Node class that represents a node of a persistent BST.
+# A node is never changed after it is created: an update copies the nodes on the path
+# from the root to the changed position and shares every other subtree with the old
+# version of the tree. There are no parent pointers, since a shared subtree can belong
+# to many versions at once.
+class PNode:
+    __slots__ = ("key", "left", "right", "height")
+
+    def __init__(self, key, left=None, right=None):
+        self.key = key
+        self.left = left
+        self.right = right
+        self.height = max(Height(left), Height(right)) + 1 # AVL height of the subtree
+
+# Persistent tree class that holds the newest version of the tree.
+# Writers serialize on write_lock, build the new version beside the old one and then
+# publish it with a single assignment to root. Readers never lock: they take the current
+# root as a snapshot, which stays valid and unchanged for as long as they use it.
+class PersistentTree:
+    def __init__(self):
+        self.root = None
+        self.write_lock = threading.Lock()
+
+# Function that returns the height of a subtree; missing leaves (None) have height 0.
+def Height(x):
+    return 0 if x == None else x.height
+
+# Function that returns a new node with the given children, rebalanced with AVL rotations.
+# The children are balanced AVL trees whose heights differ by at most 2.
+def Balance(key, left, right):
+    if Height(left) > Height(right) + 1:
+        # Left-right case: rotate the left child to the left first
+        if Height(left.left) < Height(left.right):
+            left = PNode(left.right.key, PNode(left.key, left.left, left.right.left), left.right.right)
+        # Rotate right: the left child becomes the root of the subtree
+        return PNode(left.key, left.left, PNode(key, left.right, right))
+    if Height(right) > Height(left) + 1:
+        # Right-left case: rotate the right child to the right first
+        if Height(right.right) < Height(right.left):
+            right = PNode(right.left.key, right.left.left, PNode(right.key, right.left.right, right.right))
+        # Rotate left: the right child becomes the root of the subtree
+        return PNode(right.key, PNode(key, left, right.left), right.right)
+    return PNode(key, left, right)
+
+# Function that returns the root of a new version of the subtree x with k inserted.
+# Only the O(log n) nodes on the search path (and at most two rotated nodes) are copied.
+def Persistent_Insert_Node(x, k):
+    if x == None:
+        return PNode(k)
+    if k < x.key:
+        return Balance(x.key, Persistent_Insert_Node(x.left, k), x.right)
+    else: # equal keys go to the right, like in Tree_Insert
+        return Balance(x.key, x.left, Persistent_Insert_Node(x.right, k))
+
+# Function that returns the new version of the subtree x without its minimum, and that minimum.
+def Persistent_Delete_Minimum(x):
+    if x.left == None:
+        return x.right, x.key
+    left, minimum = Persistent_Delete_Minimum(x.left)
+    return Balance(x.key, left, x.right), minimum
+
+# Function that returns the root of a new version of the subtree x with one node with key k
+# removed, or x itself if k is not in the subtree.
+def Persistent_Delete_Node(x, k):
+    if x == None:
+        return None
+    if k < x.key:
+        left = Persistent_Delete_Node(x.left, k)
+        return x if left is x.left else Balance(x.key, left, x.right)
+    if x.key < k:
+        right = Persistent_Delete_Node(x.right, k)
+        return x if right is x.right else Balance(x.key, x.left, right)
+    # x holds the key: splice it out like in RB_Delete
+    if x.left == None:
+        return x.right
+    if x.right == None:
+        return x.left
+    # Two children: the successor (the minimum of the right subtree) takes x's place
+    right, successor = Persistent_Delete_Minimum(x.right)
+    return Balance(successor, x.left, right)
+
+# Function that inserts key k into the persistent tree and publishes the new version.
+def Persistent_Insert(T, k):
+    with T.write_lock:
+        T.root = Persistent_Insert_Node(T.root, k) # atomic publish of the new root
+
+# Function that removes one node with key k from the persistent tree; returns False if k is missing.
+def Persistent_Delete(T, k):
+    with T.write_lock:
+        root = Persistent_Delete_Node(T.root, k)
+        if root is T.root:
+            return False
+        T.root = root # atomic publish of the new root
+        return True
+
+# Function that returns an immutable snapshot of the current version of the tree.
+# Reading one attribute is atomic, so no lock is needed, and every function below can be
+# used on the snapshot while writers keep publishing new versions.
+def Snapshot(T):
+    return T.root
+
+# Function that searches for a key in a snapshot.
+def Snapshot_Search(x, k):
+    while x != None and k != x.key:
+        if k < x.key:
+            x = x.left
+        else:
+            x = x.right
+    return x
+
+# Function that returns the node with the minimum key in a snapshot, or None if it is empty.
+def Snapshot_Minimum(x):
+    if x == None:
+        return None
+    while x.left != None:
+        x = x.left # reach the leftmost node
+    return x
+
+# Function that returns the node with the maximum key in a snapshot, or None if it is empty.
+def Snapshot_Maximum(x):
+    if x == None:
+        return None
+    while x.right != None:
+        x = x.right # reach the rightmost node
+    return x
+
+# Function that returns the node with the smallest key greater than k in a snapshot, or None.
+# Without parent pointers the successor is found by a search from the root.
+def Snapshot_Successor(x, k):
+    y = None # lowest node seen so far with key > k
+    while x != None:
+        if k < x.key:
+            y = x
+            x = x.left
+        else:
+            x = x.right
+    return y
+
+# Function that returns the node with the largest key less than k in a snapshot, or None.
+def Snapshot_Predecessor(x, k):
+    y = None # highest node seen so far with key < k
+    while x != None:
+        if x.key < k:
+            y = x
+            x = x.right
+        else:
+            x = x.left
+    return y
+
+# Function that lazily yields the keys k with lo <= k < hi of a snapshot in sorted order.
+# The stack holds the nodes on the path whose key and right subtree are still to be visited,
+# so the scan is iterative and takes O(log n) memory.
+def Snapshot_Range(x, lo, hi):
+    stack = []
+    # Descend to the first key not less than lo, keeping the nodes still to be visited
+    while x != None:
+        if lo <= x.key:
+            stack.append(x)
+            x = x.left
+        else:
+            x = x.right
+    while stack:
+        x = stack.pop()
+        if not x.key < hi:
+            return
+        yield x.key
+        # The next keys are those of the right subtree, smallest first
+        x = x.right
+        while x != None:
+            stack.append(x)
+            x = x.left
+
+# Function that lazily yields all the keys of a snapshot in sorted order.
+def Snapshot_Items(x):
+    stack = []
+    while stack or x != None:
+        if x != None:
+            stack.append(x)
+            x = x.left
+        else:
+            x = stack.pop()
+            yield x.key
+            x = x.right
+
+# Test case 1
+Tree1 = PersistentTree()
+for key in [15, 6, 18, 3, 7, 17, 20, 2, 4, 13, 9]:
+    Persistent_Insert(Tree1, key)
+old = Snapshot(Tree1) # version before the updates below
+Persistent_Insert(Tree1, 10)
+Persistent_Delete(Tree1, 15)
+new = Snapshot(Tree1)
+print("Old snapshot: ", list(Snapshot_Items(old)))
+print("New snapshot: ", list(Snapshot_Items(new)))
+print("Search 15 in old and new: ", Snapshot_Search(old, 15) != None, Snapshot_Search(new, 15) != None)
+print("Successor of 13 in old and new: ", Snapshot_Successor(old, 13).key, Snapshot_Successor(new, 13).key)
+print("Predecessor of 10 in new: ", Snapshot_Predecessor(new, 10).key)
+print("Keys in [5, 16) of new: ", list(Snapshot_Range(new, 5, 16)), "\n")
+
+# Test case 2
+Tree2 = PersistentTree()
+n = 20000
+errors = []
+
+# Reader that checks every snapshot it takes is a complete, sorted version
+def reader():
+    for _ in range(200):
+        snapshot = Snapshot(Tree2)
+        keys = list(Snapshot_Range(snapshot, 0, n))
+        if keys != list(range(len(keys))): # keys arrive in order, so a version holds 0..m-1
+            errors.append(len(keys))
+
+readers = [threading.Thread(target=reader) for _ in range(4)]
+for thread in readers:
+    thread.start()
+for key in range(n): # the writer keeps going while the readers scan
+    Persistent_Insert(Tree2, key)
+for thread in readers:
+    thread.join()
+print("Inconsistent snapshots seen by the readers: ", len(errors))
+print("Height after", n, "sorted inserts: ", Height(Snapshot(Tree2)))
\ No newline at end of file
@@ -1,5 +1,9 @@
 # Implementation for open addressing with double hashing and collision resolution
 
+import random
+import sys
+import time
+
 # Function representing the first hash function
 def h1(k, m):
     return k % m 
@@ -14,6 +18,11 @@ def h2_case2(k, m):
     # Logic for second test case
     return (m - 2) - (k % (m - 2))
 
+# Function representing a second hash function with a step of 1, which turns double
+# hashing into linear probing
+def h2_linear(k, m):
+  return 1
+
 # Function for inserting a key into the hash table
 # Takes in the hash table T, key k, table size m, and hash functions h1 and h2
 def hashInsert(T, k, m, h1, h2): 
@@ -69,6 +78,277 @@ def printHashTable(T):
       print(T[i], end=" ")
   print("\n")
 
+# Marker for a deleted slot of a HashMap.
+# Unlike the "DELETED" string used by hashInsert, it can never be equal to a key.
+TOMBSTONE = object()
+
+# Function that returns the smallest prime number that is not less than n
+def nextPrime(n):
+  n = max(n, 2)
+  while True:
+    # Trial division by the odd numbers up to the square root of n
+    if n == 2 or (n % 2 == 1 and all(n % d != 0 for d in range(3, int(n ** 0.5) + 1, 2))):
+      return n
+    n += 1
+
+# Class for a resizable hash map of key/value pairs using open addressing with double hashing
+# The probe steps come from h2 (h2_case1 by default). The table size m is always prime,
+# so every step between 1 and m - 1 visits all m slots.
+# The table grows to the next prime after 2m once more than maxLoad * m slots hold keys,
+# and deleted slots are marked with TOMBSTONE. Tombstones keep probe sequences going,
+# so once they take up more than maxTombstoneRatio * m slots the table is rehashed
+# at the same size to clear them and keep searches short.
+class HashMap:
+  def __init__(self, capacity=13, maxLoad=0.5, maxTombstoneRatio=0.25, h2=h2_case1):
+    if not 0 < maxLoad < 1 or maxTombstoneRatio <= 0 or maxLoad + maxTombstoneRatio >= 1:
+      # There must always be an empty slot to end unsuccessful searches
+      raise ValueError("need 0 < maxLoad < 1 and maxLoad + maxTombstoneRatio < 1")
+    self.maxLoad = maxLoad
+    self.maxTombstoneRatio = maxTombstoneRatio
+    self.h2 = h2
+    self.m = nextPrime(max(capacity, 3)) # h2_case1 needs m > 2
+    self.keys = [None] * self.m
+    self.values = [None] * self.m
+    self.size = 0 # Number of keys in the table
+    self.tombstones = 0 # Number of slots marked with TOMBSTONE
+
+  # Method that returns the number of keys in the table
+  def __len__(self):
+    return self.size
+
+  # Method that returns the index of the slot holding key k, or None
+  def findSlot(self, k):
+    m = self.m
+    h = hash(k)
+    q = h1(h, m)
+    step = self.h2(h, m)
+    # Loop until the key or an empty slot is found
+    for _ in range(m):
+      slot = self.keys[q]
+      if slot is None:
+        return None
+      if slot is not TOMBSTONE and slot == k:
+        return q
+      q = (q + step) % m
+    return None
+
+  # Method for inserting key k with value v, replacing the value if k is already in the table
+  def insert(self, k, v):
+    m = self.m
+    h = hash(k)
+    q = h1(h, m)
+    step = self.h2(h, m)
+    firstTombstone = None
+    # Loop until the key or an empty slot is found, remembering the first tombstone
+    while True:
+      slot = self.keys[q]
+      if slot is None:
+        break
+      if slot is TOMBSTONE:
+        if firstTombstone is None:
+          firstTombstone = q
+      elif slot == k:
+        # Key already exists in the table
+        self.values[q] = v
+        return
+      q = (q + step) % m
+    # Reuse the first tombstone on the probe sequence if there is one
+    if firstTombstone is not None:
+      q = firstTombstone
+      self.tombstones -= 1
+    self.keys[q] = k
+    self.values[q] = v
+    self.size += 1
+    # Grow once the load factor crosses the threshold
+    if self.size > self.maxLoad * self.m:
+      self.rehash(nextPrime(2 * self.m))
+
+  # Method for searching a key; returns its value, or None if the key is not in the table
+  def search(self, k):
+    q = self.findSlot(k)
+    return None if q is None else self.values[q]
+
+  # Method that checks whether key k is in the table
+  def __contains__(self, k):
+    return self.findSlot(k) is not None
+
+  # Method that returns the number of slots a search for key k examines
+  def probeCount(self, k):
+    m = self.m
+    h = hash(k)
+    q = h1(h, m)
+    step = self.h2(h, m)
+    probes = 1
+    while self.keys[q] is not None and (self.keys[q] is TOMBSTONE or self.keys[q] != k) and probes < m:
+      q = (q + step) % m
+      probes += 1
+    return probes
+
+  # Method for deleting a key; returns False if the key is not in the table
+  def delete(self, k):
+    q = self.findSlot(k)
+    if q is None:
+      return False
+    # Mark the slot so that searches for keys further along the probe sequence continue
+    self.keys[q] = TOMBSTONE
+    self.values[q] = None
+    self.size -= 1
+    self.tombstones += 1
+    # Compact once the tombstones cross the threshold
+    if self.tombstones > self.maxTombstoneRatio * self.m:
+      self.rehash(self.m)
+    return True
+
+  # Method that yields the (key, value) pairs in the table
+  def items(self):
+    for k, v in zip(self.keys, self.values):
+      if k is not None and k is not TOMBSTONE:
+        yield k, v
+
+  # Method that moves every key into a new table of size m, dropping the tombstones
+  def rehash(self, m):
+    pairs = list(self.items())
+    self.m = m
+    self.keys = [None] * m
+    self.values = [None] * m
+    self.tombstones = 0
+    # The keys are distinct, so each one goes to the first empty slot of its probe sequence
+    for k, v in pairs:
+      h = hash(k)
+      q = h1(h, m)
+      step = self.h2(h, m)
+      while self.keys[q] is not None:
+        q = (q + step) % m
+      self.keys[q] = k
+      self.values[q] = v
+
+# Class for a hash map that uses Robin Hood insertion with linear probing
+# The probe distance of a key is how far it sits from its home slot h1(k, m). An insert
+# takes the slot of any key that is closer to its home than the new key is and carries
+# that key further, so probe distances stay short and even at high load. This makes
+# keys along a run ordered by home slot, so an unsuccessful search can stop as soon
+# as it reaches a key closer to its home than the search has travelled, and a delete
+# shifts the following keys back one slot instead of leaving a tombstone.
+class RobinHoodHashMap(HashMap):
+  def __init__(self, capacity=13, maxLoad=0.9):
+    # The tombstone ratio is never used, since deletes leave no tombstones
+    HashMap.__init__(self, capacity, maxLoad, (1 - maxLoad) / 2)
+    self.dist = [0] * self.m # Probe distance of the key in each slot
+
+  # Method that returns the index of the slot holding key k, or None
+  def findSlot(self, k):
+    m = self.m
+    q = h1(hash(k), m)
+    d = 0
+    # Loop until the key, an empty slot or a key closer to its home is found
+    while True:
+      slot = self.keys[q]
+      if slot is None or self.dist[q] < d:
+        return None
+      if slot == k:
+        return q
+      q = (q + 1) % m
+      d += 1
+
+  # Method that returns the number of slots a search for key k examines
+  def probeCount(self, k):
+    m = self.m
+    q = h1(hash(k), m)
+    d = 0
+    while self.keys[q] is not None and self.dist[q] >= d and self.keys[q] != k:
+      q = (q + 1) % m
+      d += 1
+    return d + 1
+
+  # Method for inserting key k with value v, replacing the value if k is already in the table
+  def insert(self, k, v):
+    m = self.m
+    q = h1(hash(k), m)
+    d = 0
+    while True:
+      slot = self.keys[q]
+      if slot is None:
+        break
+      if slot == k:
+        # Key already exists in the table
+        self.values[q] = v
+        return
+      if self.dist[q] < d:
+        # Take the slot from the key closer to its home and carry that key on
+        self.keys[q], k = k, slot
+        self.values[q], v = v, self.values[q]
+        self.dist[q], d = d, self.dist[q]
+      q = (q + 1) % m
+      d += 1
+    self.keys[q] = k
+    self.values[q] = v
+    self.dist[q] = d
+    self.size += 1
+    # Grow once the load factor crosses the threshold
+    if self.size > self.maxLoad * self.m:
+      self.rehash(nextPrime(2 * self.m))
+
+  # Method for deleting a key with backward shifting; returns False if the key is not in the table
+  def delete(self, k):
+    q = self.findSlot(k)
+    if q is None:
+      return False
+    m = self.m
+    j = (q + 1) % m
+    # Shift the following keys back one slot until an empty slot or a key at its home
+    while self.keys[j] is not None and self.dist[j] > 0:
+      self.keys[q] = self.keys[j]
+      self.values[q] = self.values[j]
+      self.dist[q] = self.dist[j] - 1
+      q = j
+      j = (j + 1) % m
+    self.keys[q] = None
+    self.values[q] = None
+    self.dist[q] = 0
+    self.size -= 1
+    return True
+
+  # Method that moves every key into a new table of size m
+  def rehash(self, m):
+    pairs = list(self.items())
+    self.m = m
+    self.keys = [None] * m
+    self.values = [None] * m
+    self.dist = [0] * m
+    self.size = 0
+    for k, v in pairs:
+      self.insert(k, v)
+
+# Function that compares double hashing (h1 and h2_case1), plain linear probing and Robin Hood
+# probing at the same load. It reports the average and the worst number of slots examined
+# by successful and unsuccessful searches, and the time per search. Robin Hood is built
+# on linear probing, so the linear probing row separates the two effects: Robin Hood
+# bounds the worst case and shortens unsuccessful searches, but linear probing clusters,
+# so successful searches examine more slots on average than with double hashing.
+def benchmarkRobinHood(n=50000, load=0.9, seed=0):
+  rng = random.Random(seed)
+  keys = rng.sample(range(10 ** 9), 2 * n)
+  present = keys[:n] # keys that are inserted
+  missing = keys[n:] # keys that are searched for but never inserted
+  m = nextPrime(int(n / load))
+  print(f"n = {n}, m = {m}, load = {n / m:.2f}")
+  # maxLoad is just above the target load so that the tables do not grow
+  maxLoad = n / m + 0.001
+  tables = [("double hashing", HashMap(m, maxLoad, (1 - maxLoad) / 2)),
+            ("linear probing", HashMap(m, maxLoad, (1 - maxLoad) / 2, h2_linear)),
+            ("Robin Hood", RobinHoodHashMap(m, maxLoad))]
+  for name, H in tables:
+    for k in present:
+      H.insert(k, k)
+    for label, queries in [("hit", present), ("miss", missing)]:
+      probes = [H.probeCount(k) for k in queries]
+      start = time.perf_counter()
+      for k in queries:
+        H.search(k)
+      elapsed = time.perf_counter() - start
+      print(f"{name:>15} {label:>4}: average {sum(probes) / len(probes):5.2f} probes,"
+            f" worst {max(probes):4d}, {elapsed / len(queries) * 1e9:6.0f} ns per search")
+
 # Test case 1
 print("Test case 1:")
 # Initialize the hash table with size m = 13
@@ -124,4 +404,36 @@ for key in search_keys_in_T2:
     print(f"Key {key} found at index {result}")
   # Otherwise, the key does not exist
   else:
-    print(f"Key {key} not found")
\ No newline at end of file
+    print(f"Key {key} not found\n")
+
+# Test case 3
+print("Test case 3:")
+# Start with a small table that grows as keys are inserted and is compacted
+# once tombstones fill more than 10% of its slots
+H = HashMap(capacity=7, maxTombstoneRatio=0.1)
+for key in [79, 69, 72, 50, 98, 14, 10, 82, 40, 35]:
+  H.insert(key, f"value {key}")
+print(f"Table size after 10 inserts: {H.m}, keys: {len(H)}")
+print(f"Search 14: {H.search(14)}, search 66: {H.search(66)}")
+
+# Delete keys; the fourth delete triggers a compaction that clears the tombstones
+for key in [79, 69, 72, 50, 98, 14]:
+  H.delete(key)
+print(f"Keys after 6 deletes: {len(H)}, tombstones: {H.tombstones}")
+print(f"Search 40: {H.search(40)}, search 72: {H.search(72)}")
+H.insert("name", "Robin") # any hashable key works
+print(f"Search 'name': {H.search('name')}")
+
+# Test case 4
+print("\nTest case 4:")
+R = RobinHoodHashMap(capacity=7)
+for key in [10, 82, 40, 35, 15, 21, 52]:
+  R.insert(key, f"value {key}")
+print(f"Table size after 7 inserts: {R.m}, keys: {len(R)}")
+R.delete(35) # the following keys shift back, no tombstone is left
+print(f"Search 52: {R.search(52)}, search 35: {R.search(35)}, search 11: {R.search(11)}\n")
+
+# Benchmark against double hashing and linear probing at 90% load; it is opt-in:
+# run "python hashmap.py --benchmark"
+if __name__ == "__main__" and "--benchmark" in sys.argv:
+  benchmarkRobinHood()
\ No newline at end of file
@@ -0,0 +1,302 @@
+# Implementation for a compact open-addressing hash table of 64-bit integer keys and values
+
+import random
+import sys
+import time
+from array import array
+
+# NumPy is optional: without it the batch operations fall back to loops in pure Python
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
+# Reserved key values that mark empty and deleted slots; they cannot be used as keys
+EMPTY = -2 ** 63
+DELETED = -2 ** 63 + 1
+# Multiplier for Fibonacci hashing (2^64 divided by the golden ratio), which spreads
+# consecutive IDs over the whole table
+MULTIPLIER = 0x9E3779B97F4A7C15
+MASK64 = 2 ** 64 - 1
+
+# Class for a hash table of 64-bit integer keys and values stored in two typed arrays
+# Every slot takes 16 bytes (two array('q') entries) instead of pointers to boxed ints,
+# and empty and deleted slots are the reserved keys EMPTY and DELETED, so each probe is
+# a single integer comparison. The size is a power of two and collisions are resolved
+# by linear probing. The table is rebuilt (twice as large if needed) before keys and
+# deleted slots together would pass maxLoad of the slots.
+class IntHashTable:
+  def __init__(self, capacity=16, maxLoad=0.7, useNumpy=None):
+    if not 0 < maxLoad < 1:
+      raise ValueError("need 0 < maxLoad < 1")
+    if useNumpy is None:
+      useNumpy = np is not None
+    if useNumpy and np is None:
+      raise ImportError("NumPy is not installed")
+    self.useNumpy = useNumpy
+    self.maxLoad = maxLoad
+    self.size = 0 # Number of keys in the table
+    self.tombstones = 0 # Number of slots marked DELETED
+    m = 16
+    while m < capacity:
+      m *= 2
+    self.allocate(m)
+
+  # Method that replaces the slots with m empty ones (m is a power of two)
+  def allocate(self, m):
+    self.m = m
+    self.bits = m.bit_length() - 1 # m = 2^bits
+    self.keys = array("q", [EMPTY]) * m
+    self.values = array("q", [0]) * m
+
+  # Method that returns the number of keys in the table
+  def __len__(self):
+    return self.size
+
+  # Method that returns the number of bytes used by the slots
+  def nbytes(self):
+    return (len(self.keys) + len(self.values)) * self.keys.itemsize
+
+  # Method that returns the home slot of key k: the top bits of k times the multiplier
+  def home(self, k):
+    return ((k & MASK64) * MULTIPLIER & MASK64) >> (64 - self.bits)
+
+  # Method that makes room for count more keys, growing or clearing tombstones if needed
+  def reserve(self, count):
+    if self.size + self.tombstones + count <= self.maxLoad * self.m:
+      return
+    m = self.m
+    while self.size + count > self.maxLoad * m:
+      m *= 2
+    self.rehash(m)
+
+  # Method that moves every key into a new table of m slots, dropping the tombstones
+  def rehash(self, m):
+    if self.useNumpy:
+      live = np.frombuffer(self.keys, dtype=np.int64) > DELETED
+      keys = np.frombuffer(self.keys, dtype=np.int64)[live]
+      values = np.frombuffer(self.values, dtype=np.int64)[live]
+      self.allocate(m)
+      self.size = 0 # placeMany counts the keys again
+      self.tombstones = 0
+      self.placeMany(keys, values)
+    else:
+      pairs = list(self.items())
+      self.allocate(m)
+      self.tombstones = 0
+      for k, v in pairs:
+        q = self.home(k)
+        while self.keys[q] != EMPTY:
+          q = (q + 1) & (m - 1)
+        self.keys[q] = k
+        self.values[q] = v
+
+  # Method for inserting key k with value v, replacing the value if k is already in the table
+  def insert(self, k, v):
+    if k == EMPTY or k == DELETED:
+      raise ValueError("key is reserved")
+    self.reserve(1)
+    mask = self.m - 1
+    q = self.home(k)
+    firstDeleted = -1
+    # Loop until the key or an empty slot is found, remembering the first deleted slot
+    while True:
+      slot = self.keys[q]
+      if slot == EMPTY:
+        break
+      if slot == k:
+        # Key already exists in the table
+        self.values[q] = v
+        return
+      if slot == DELETED and firstDeleted < 0:
+        firstDeleted = q
+      q = (q + 1) & mask
+    # Reuse the first deleted slot on the probe sequence if there is one
+    if firstDeleted >= 0:
+      q = firstDeleted
+      self.tombstones -= 1
+    self.keys[q] = k
+    self.values[q] = v
+    self.size += 1
+
+  # Method that returns the index of the slot holding key k, or -1
+  def findSlot(self, k):
+    mask = self.m - 1
+    q = self.home(k)
+    # Loop until the key or an empty slot is found
+    while True:
+      slot = self.keys[q]
+      if slot == k:
+        return q
+      if slot == EMPTY:
+        return -1
+      q = (q + 1) & mask
+
+  # Method for searching a key; returns its value, or None if the key is not in the table
+  def search(self, k):
+    if k == EMPTY or k == DELETED:
+      return None
+    q = self.findSlot(k)
+    return None if q < 0 else self.values[q]
+
+  # Method that checks whether key k is in the table
+  def __contains__(self, k):
+    return self.search(k) is not None
+
+  # Method for deleting a key; returns False if the key is not in the table
+  def delete(self, k):
+    if k == EMPTY or k == DELETED:
+      return False
+    q = self.findSlot(k)
+    if q < 0:
+      return False
+    # Mark the slot so that searches for keys further along the probe sequence continue
+    self.keys[q] = DELETED
+    self.size -= 1
+    self.tombstones += 1
+    return True
+
+  # Method that yields the (key, value) pairs in the table
+  def items(self):
+    for k, v in zip(self.keys, self.values):
+      if k != EMPTY and k != DELETED:
+        yield k, v
+
+  # Method that returns the home slots of a NumPy array of keys
+  def homeMany(self, keys):
+    # uint64 arithmetic wraps around, just like the masking in home()
+    product = keys.view(np.uint64) * np.uint64(MULTIPLIER)
+    return (product >> np.uint64(64 - self.bits)).astype(np.int64)
+
+  # Method that returns the slot of every key of a NumPy array (-1 for missing keys).
+  # All the keys probe in lockstep: each round compares every unfinished key with its
+  # current slot and moves the keys that are neither found nor stopped to the next slot.
+  def findSlotsMany(self, keys):
+    T = np.frombuffer(self.keys, dtype=np.int64)
+    mask = self.m - 1
+    pos = self.homeMany(keys)
+    slots = np.full(len(keys), -1, dtype=np.int64)
+    active = np.arange(len(keys))
+    while active.size:
+      p = pos[active]
+      slot = T[p]
+      found = slot == keys[active]
+      slots[active[found]] = p[found]
+      # Keep probing the keys that were not found and did not reach an empty slot
+      going = ~found & (slot != EMPTY)
+      active = active[going]
+      pos[active] = (p[going] + 1) & mask
+    return slots
+
+  # Method that stores keys that are distinct and not in the table yet (NumPy arrays).
+  # Each round every unplaced key looks at its current slot; among the keys that see a
+  # free slot, one key per slot takes it, and all the others move on to the next slot.
+  def placeMany(self, keys, values):
+    T = np.frombuffer(self.keys, dtype=np.int64)
+    V = np.frombuffer(self.values, dtype=np.int64)
+    mask = self.m - 1
+    pos = self.homeMany(keys)
+    pending = np.arange(len(keys))
+    while pending.size:
+      p = pos[pending]
+      free = np.flatnonzero(T[p] <= DELETED) # EMPTY or DELETED slots
+      # The first key of the batch that sees a free slot takes it
+      _, first = np.unique(p[free], return_index=True)
+      winners = free[first]
+      q = p[winners]
+      self.tombstones -= int(np.count_nonzero(T[q] == DELETED))
+      T[q] = keys[pending[winners]]
+      V[q] = values[pending[winners]]
+      placed = np.zeros(pending.size, dtype=bool)
+      placed[winners] = True
+      pending = pending[~placed]
+      pos[pending] = (pos[pending] + 1) & mask
+    self.size += len(keys)
+
+  # Method for inserting a batch of keys with their values (a later duplicate wins).
+  # With NumPy the whole batch is hashed and probed with array operations.
+  def insertMany(self, keys, values):
+    if not self.useNumpy:
+      for k, v in zip(keys, values):
+        self.insert(k, v)
+      return
+    keys = np.asarray(keys, dtype=np.int64)
+    values = np.broadcast_to(np.asarray(values, dtype=np.int64), keys.shape)
+    if np.any(keys <= DELETED):
+      raise ValueError("key is reserved")
+    # Keep the last value of every repeated key, like inserting the keys one by one
+    keys, last = np.unique(keys[::-1], return_index=True)
+    values = values[::-1][last]
+    # Update the keys that are already in the table
+    slots = self.findSlotsMany(keys)
+    found = slots >= 0
+    np.frombuffer(self.values, dtype=np.int64)[slots[found]] = values[found]
+    # Add the others, after making room for them
+    keys = keys[~found]
+    values = values[~found]
+    self.reserve(len(keys))
+    self.placeMany(keys, values)
+
+  # Method for looking up a batch of keys; returns their values, with missing for absent keys
+  # (a NumPy array with NumPy, an array('q') otherwise)
+  def lookupMany(self, keys, missing=-1):
+    if not self.useNumpy:
+      result = array("q")
+      for k in keys:
+        v = self.search(k)
+        result.append(missing if v is None else v)
+      return result
+    keys = np.asarray(keys, dtype=np.int64)
+    result = np.full(len(keys), missing, dtype=np.int64)
+    # The reserved keys would match the empty or deleted slots, so they are never looked up
+    valid = np.flatnonzero(keys > DELETED)
+    slots = self.findSlotsMany(keys[valid])
+    found = slots >= 0
+    result[valid[found]] = np.frombuffer(self.values, dtype=np.int64)[slots[found]]
+    return result
+
+# Function that measures batch inserts and lookups of n random IDs with and without NumPy.
+def benchmarkIntHashTable(n=1000000, seed=0):
+  rng = random.Random(seed)
+  ids = [rng.getrandbits(62) for _ in range(n)]
+  dictionary = dict(zip(ids, range(n)))
+  dictionaryBytes = sys.getsizeof(dictionary) + sum(sys.getsizeof(k) for k in ids[:1000]) * n // 1000
+  print(f"n = {n}: dict with boxed int keys takes about {dictionaryBytes / n:.0f} bytes per key")
+  modes = [False] if np is None else [False, True]
+  for useNumpy in modes:
+    H = IntHashTable(useNumpy=useNumpy)
+    start = time.perf_counter()
+    H.insertMany(ids, range(n))
+    insertTime = time.perf_counter() - start
+    start = time.perf_counter()
+    found = H.lookupMany(ids)
+    lookupTime = time.perf_counter() - start
+    assert list(found) == list(range(n))
+    print(f"{'NumPy' if useNumpy else 'pure Python':>12}: insertMany {insertTime:.2f} s,"
+          f" lookupMany {lookupTime:.2f} s, {H.nbytes() / n:.0f} bytes per key")
+
+# Test case 1
+print("Test case 1:")
+T1 = IntHashTable(useNumpy=False)
+for key in [79, 69, 72, 50, 98, 14]:
+  T1.insert(key, key * 10)
+print(f"Search 14: {T1.search(14)}, search 66: {T1.search(66)}")
+T1.delete(14)
+print(f"Search 14 after delete: {T1.search(14)}, keys: {len(T1)}, table size: {T1.m}")
+print("lookupMany:", T1.lookupMany([79, 14, 98, -5]).tolist(), "\n")
+
+# Test case 2
+print("Test case 2:")
+if np is not None:
+  T2 = IntHashTable(useNumpy=True)
+  ids = np.arange(0, 2000, 2, dtype=np.int64) # consecutive IDs
+  T2.insertMany(ids, ids * 10)
+  print(f"Keys: {len(T2)}, table size: {T2.m}")
+  print("lookupMany:", T2.lookupMany([0, 1, 1998, 2000]).tolist())
+else:
+  print("NumPy is not installed, so the batch operations use the pure Python loops")
+print()
+
+# The benchmark loads a million IDs, so it is opt-in: run "python intHashTable.py --benchmark"
+if __name__ == "__main__" and "--benchmark" in sys.argv:
+  benchmarkIntHashTable()